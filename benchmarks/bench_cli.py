@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+CLI Scenario Benchmark
+
+Generates deterministic harness data at one or more scales (see
+generators.py), runs every CLI entry point and ledger-manager command
+against it in a throwaway HOME and records wall-clock timings. Scenarios
+that write the ledgers run on a fresh copy of the generated state, so
+results do not depend on which scenarios were selected. Results are written
+to a JSON file that a later run can be compared against to catch
+regressions.
+
+Usage:
+    python ~/.agent/benchmarks/bench_cli.py [--scale small --scale medium] [--runs 5]
+        [--scenario NAME]... [--output results.json] [--compare baseline.json]
+
+Exit codes:
+    0: Completed (no regressions against --compare)
+    1: Regression against --compare, or a scenario failed to run
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import generators
+
+RESULTS_DIR = BENCH_DIR / "results"
+
+LEDGER = "ledgers/ledger-manager.py"
+
+# Ledger state restored from a snapshot around every run of a mutating scenario
+LEDGER_STATE = ("task_ledger.json", "progress_ledger.json", "checkpoint_policy.json",
+                "checkpoints", "missions")
+
+# name -> (argv builder taking the generated facts, cwd key, expected exit codes, mutates ledgers)
+SCENARIOS = {
+    "ledger-status": (lambda f: [LEDGER, "status"], "agent", {0}, False),
+    "ledger-resume": (lambda f: [LEDGER, "resume"], "agent", {0}, False),
+    "ledger-as-of-step": (lambda f: [LEDGER, "as-of", str(f["sizes"]["steps"] // 2)],
+                          "agent", {0}, False),
+    "ledger-as-of-time": (lambda f: [LEDGER, "as-of",
+                                     (generators.EPOCH + timedelta(
+                                         seconds=15 * f["sizes"]["steps"])).isoformat()],
+                          "agent", {0}, False),
+    "ledger-policy": (lambda f: [LEDGER, "policy"], "agent", {0}, False),
+    "ledger-missions": (lambda f: [LEDGER, "missions"], "agent", {0}, False),
+    "ledger-init": (lambda f: [LEDGER, "--mission", "bench-init", "init", "bench-init",
+                               "Bench mission", "--goals", "bench"], "agent", {0}, True),
+    "ledger-add-task": (lambda f: [LEDGER, "add-task", "bench-task", "Bench task"],
+                        "agent", {0}, True),
+    "ledger-add-step": (lambda f: [LEDGER, "add-step", "task-15", "Bench step", "ok"],
+                        "agent", {0}, True),
+    # import is an alias of add-steps; both replay a batch the size of the ledger
+    "ledger-add-steps": (lambda f: [LEDGER, "add-steps", str(f["step_batch"])], "agent", {0}, True),
+    "ledger-import": (lambda f: [LEDGER, "import", str(f["step_batch"])], "agent", {0}, True),
+    # task-15 is open; the default policy checkpoints on completion
+    "ledger-complete-task": (lambda f: [LEDGER, "complete-task", "task-15"], "agent", {0}, True),
+    "ledger-checkpoint": (lambda f: [LEDGER, "checkpoint", "--reason", "bench"], "agent", {0}, True),
+    "ledger-rollback": (lambda f: [LEDGER, "rollback", f["checkpoint_id"]], "agent", {0}, True),
+    "audit-report": (lambda f: ["bin/session-audit-log", "--report"], "agent", {0}, False),
+    "audit-check": (lambda f: ["bin/session-audit-log", "--check", f["session_id"]],
+                    "agent", {0}, False),
+    "audit-timings": (lambda f: ["bin/session-audit-log", "--timings"], "agent", {0}, False),
+    "sop-validate": (lambda f: ["scripts/validate_sop_consistency.py",
+                                "--project-dir", str(f["workspace"])], "workspace", {0, 1, 2}, False),
+    "todo-enforcer": (lambda f: ["scripts/todo-enforcer.py"], "workspace", {0, 1}, False),
+    "session-gate": (lambda f: ["scripts/session_gate.py"], "workspace", {0}, False),
+}
+
+# A scenario regresses when it is both this much slower and this many ms slower
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+def snapshot_ledgers(facts: dict, snapshot: Path):
+    """Copy the generated ledger state aside so mutating scenarios can reset it."""
+    ledger_dir = facts["agent"] / "ledgers"
+    snapshot.mkdir(parents=True)
+    for name in LEDGER_STATE:
+        src = ledger_dir / name
+        if src.is_dir():
+            shutil.copytree(src, snapshot / name)
+        elif src.exists():
+            shutil.copy2(src, snapshot / name)
+
+
+def restore_ledgers(facts: dict, snapshot: Path):
+    """Put the ledger state back exactly as generated (not timed)."""
+    ledger_dir = facts["agent"] / "ledgers"
+    for name in LEDGER_STATE:
+        dst = ledger_dir / name
+        if dst.is_dir():
+            shutil.rmtree(dst)
+        elif dst.exists():
+            dst.unlink()
+        src = snapshot / name
+        if src.is_dir():
+            shutil.copytree(src, dst)
+        elif src.exists():
+            shutil.copy2(src, dst)
+
+
+def run_scenario(name: str, facts: dict, runs: int, snapshot: Path) -> dict:
+    """Best-of-N and median wall-clock time for one scenario.
+
+    Mutating scenarios start every run from the generated ledger state and
+    leave it untouched for the scenarios that follow.
+    """
+    build_argv, cwd_key, ok_codes, mutates = SCENARIOS[name]
+    argv = build_argv(facts)
+    argv[0] = str(facts["agent"] / argv[0])
+    env = dict(os.environ, HOME=str(facts["home"]), PATH=facts["path"], AGENT_PROVIDER="bench",
+               AGENT_CHECKPOINT_SYNC="1")
+    for key in ("AGENT_TRACE", "AGENT_MISSION_ID", "AGENT_SESSION_ID"):
+        env.pop(key, None)
+
+    timings = []
+    exit_code = 0
+    try:
+        for _ in range(runs):
+            if mutates:
+                restore_ledgers(facts, snapshot)
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, *argv], cwd=facts[cwd_key], env=env,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            timings.append((time.perf_counter() - start) * 1000)
+            exit_code = result.returncode
+            if exit_code not in ok_codes:
+                return {"error": f"exit code {exit_code}: {result.stderr.strip()[-300:]}"}
+    finally:
+        if mutates:
+            restore_ledgers(facts, snapshot)
+
+    return {
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "runs": runs,
+        "exit_code": exit_code,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float):
+    """Rows of (key, base_ms, new_ms, ratio, regressed) for shared scenarios."""
+    rows = []
+    for scale, scenarios in results["results"].items():
+        for name, new in scenarios.items():
+            old = baseline.get("results", {}).get(scale, {}).get(name)
+            if not old or "min_ms" not in old or "min_ms" not in new:
+                continue
+            ratio = new["min_ms"] / old["min_ms"] if old["min_ms"] else 1.0
+            regressed = ratio > 1 + tolerance and new["min_ms"] - old["min_ms"] > min_delta_ms
+            rows.append((f"{scale}/{name}", old["min_ms"], new["min_ms"], ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every harness CLI on generated data")
+    parser.add_argument("--scale", action="append", choices=list(generators.SCALES),
+                        help="Data scale(s) to run (default: small, medium)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Only run the given scenario(s)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (default: 5)")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "latest.json"),
+                        help="Results file (default: benchmarks/results/latest.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown ratio (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"Ignore slowdowns smaller than this (default: {DEFAULT_MIN_DELTA_MS})")
+    args = parser.parse_args()
+
+    scales = args.scale or ["small", "medium"]
+    results = {
+        "meta": {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "scales": {scale: generators.SCALES[scale] for scale in scales},
+        },
+        "results": {},
+    }
+    failed = []
+
+    print("⏱️  CLI Scenario Benchmark")
+    print("=" * 60)
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"cli-bench-{scale}-") as tmp:
+            facts = generators.build_home(Path(tmp), scale)
+            snapshot = Path(tmp) / "ledger-snapshot"
+            snapshot_ledgers(facts, snapshot)
+            print(f"\n📦 Scale: {scale} {facts['sizes']}")
+            scale_results = results["results"].setdefault(scale, {})
+            for name in args.scenario or SCENARIOS:
+                r = run_scenario(name, facts, args.runs, snapshot)
+                scale_results[name] = r
+                if "error" in r:
+                    failed.append(f"{scale}/{name}")
+                    print(f"  ❌ {name:<22} {r['error']}")
+                else:
+                    print(f"  ✅ {name:<22} min {r['min_ms']:>9.1f} ms   median {r['median_ms']:>9.1f} ms")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\n💾 Results written to {output}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Compared with {args.compare} "
+              f"(rev {baseline.get('meta', {}).get('git_revision')}):")
+        for key, old_ms, new_ms, ratio, regressed in compare(results, baseline, args.tolerance,
+                                                              args.min_delta_ms):
+            mark = "❌" if regressed else "✅"
+            print(f"  {mark} {key:<32} {old_ms:>9.1f} -> {new_ms:>9.1f} ms  ({ratio:.2f}x)")
+            if regressed:
+                regressions.append(key)
+
+    if failed:
+        print(f"\n❌ {len(failed)} scenario(s) failed to run: {', '.join(failed)}")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Learnings Store Benchmark
+
+Generates a synthetic memory/learnings corpus, indexes it with
+scripts/learnings_store.py and times the common lookups against a linear
+scan of the JSON arrays.
+
+Usage:
+    python ~/.agent/benchmarks/bench_learnings_store.py [--entries 100000] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AGENT_DIR / "scripts"))
+
+from learnings_store import LearningsStore
+
+SKILLS = ["JavaScript", "Reflect", "coding-standards", "Librarian", "Orchestrator", "go", "python"]
+CATEGORIES = ["accuracy_improvement", "completeness_improvement", "avoidance_rule", "preference"]
+PRIORITIES = ["low", "medium", "high"]
+WORDS = ("null check property access validate input prefer const let vanilla dom jquery "
+         "yaml extraction prompt entity relation graph repair merge session commit hook "
+         "branch review test coverage retry timeout cache index").split()
+
+
+def generate_corpus(root: Path, entries: int, seed: int = 42):
+    """Write pending/applied learnings and ace_insight files under root."""
+    rng = random.Random(seed)
+
+    def learning(i, status):
+        return {
+            "source": rng.choice(["conversation", "ace_reflector"]),
+            "content": {
+                "insight": " ".join(rng.choices(WORDS, k=12)) + f" #{i}",
+                "category": rng.choice(CATEGORIES),
+                "skill": rng.choice(SKILLS),
+            },
+            "type": "skill_update",
+            "priority": rng.choice(PRIORITIES),
+            "id": f"learning_{i}",
+            "created_at": f"2026-01-{1 + i % 28:02d}T00:00:00",
+            "status": status,
+        }
+
+    pending = [learning(i, "pending") for i in range(entries * 8 // 10)]
+    applied = [learning(i, "applied") for i in range(len(pending), entries)]
+    with open(root / "pending_learnings.json", "w") as f:
+        json.dump(pending, f)
+    with open(root / "applied_learnings.json", "w") as f:
+        json.dump(applied, f)
+
+    insights = root / "ace_insights"
+    insights.mkdir()
+    for i in range(max(1, entries // 1000)):
+        with open(insights / f"ace_insight_{i:06d}.json", "w") as f:
+            json.dump({"timestamp": "2026-01-30T00:00:00", "query": f"q{i}",
+                       "insights": [" ".join(rng.choices(WORDS, k=8)) for _ in range(3)],
+                       "type": "reflection_insight"}, f)
+    return pending
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def run_benchmark(entries: int, repeat: int):
+    with tempfile.TemporaryDirectory(prefix="learnings-bench-") as tmp:
+        root = Path(tmp)
+        pending = generate_corpus(root, entries)
+
+        store = LearningsStore(root)
+        sync_ms, summary = timed(store.sync, 1)
+        resync_ms, _ = timed(store.sync, 1)
+
+        skill = SKILLS[0]
+        scan_ms, _ = timed(lambda: [e for e in json.load(open(root / "pending_learnings.json"))
+                                    if e["content"]["skill"] == skill], 3)
+        query_ms, rows = timed(lambda: store.query(store="pending", skill=skill, limit=20), repeat)
+        search_ms, _ = timed(lambda: store.search("null check", limit=20), repeat)
+        store.close()
+
+    return {
+        "entries": entries,
+        "indexed": summary["added"],
+        "sync_ms": round(sync_ms, 1),
+        "resync_unchanged_ms": round(resync_ms, 2),
+        "linear_scan_ms": round(scan_ms, 2),
+        "query_pending_by_skill_ms": round(query_ms, 3),
+        "fts_search_ms": round(search_ms, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the learnings store")
+    parser.add_argument("--entries", type=int, default=100000, help="Synthetic learnings (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=200, help="Repetitions per lookup (default: 200)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.entries, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("⏱️  Learnings Store")
+        print("=" * 50)
+        for key, value in results.items():
+            print(f"  {key:<28} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
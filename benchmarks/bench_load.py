@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Multi-Agent Load Simulator
+
+Spawns N simulated agents that share one throwaway ~/.agent and run a
+realistic session script concurrently:
+
+    gate      scripts/session_gate.py (SESSION_START/INITIALIZED/END lines)
+    audit     session-audit-log --log (appends the log, rewrites compliance_log.json)
+    add-step  ledger-manager add-step (locked read-modify-write of the ledgers)
+    status    ledger-manager status
+
+Afterwards every shared file is checked for lost and corrupted writes, and
+the ledger lock wait time is read back from the trace spans each
+ledger-manager command records (see scripts/harness_trace.py).
+
+Usage:
+    python ~/.agent/benchmarks/bench_load.py [--agents 50] [--iterations 2]
+        [--missions shared|per-agent] [--json]
+
+Exit codes:
+    0: No lost or corrupted writes
+    1: Lost or corrupted writes detected
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import generators
+
+OPS = ("gate", "audit", "add-step", "status")
+TASK_ID = "task-15"
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, -(-len(values) * q // 100) - 1)]
+
+
+class LoadSimulator:
+    """Runs the agents and verifies the shared state they leave behind."""
+
+    def __init__(self, root: Path, agents: int, iterations: int, per_agent_missions: bool):
+        self.agents = agents
+        self.iterations = iterations
+        self.per_agent_missions = per_agent_missions
+        self.facts = generators.build_home(root, "small")
+        self.agent_dir = self.facts["agent"]
+        self.trace_file = root / "trace.jsonl"
+        self.env = dict(os.environ, HOME=str(self.facts["home"]), PATH=self.facts["path"],
+                        AGENT_PROVIDER="load", AGENT_CHECKPOINT_SYNC="1", AGENT_TRACE="1",
+                        AGENT_TRACE_FILE=str(self.trace_file))
+        for key in ("AGENT_MISSION_ID", "AGENT_SESSION_ID", "AGENT_TRACE_ID", "AGENT_TRACE_PARENT"):
+            self.env.pop(key, None)
+        self.records = []
+        self.records_lock = threading.Lock()
+
+    def ledger_cmd(self, agent: int, *args):
+        cmd = [sys.executable, str(self.agent_dir / "ledgers" / "ledger-manager.py")]
+        if self.per_agent_missions:
+            cmd += ["--mission", f"agent-{agent}"]
+        return cmd + list(args)
+
+    def setup(self):
+        """Create one mission shard per agent (not timed)."""
+        if not self.per_agent_missions:
+            return
+        env = dict(self.env)
+        env.pop("AGENT_TRACE")  # keep setup out of the lock wait samples
+        for agent in range(self.agents):
+            for args in (["init", f"agent-{agent}", "Load test", "--goals", "load"],
+                         ["add-task", TASK_ID, "Load task"]):
+                subprocess.run(self.ledger_cmd(agent, *args), env=env, check=True,
+                               stdout=subprocess.DEVNULL)
+
+    def commands(self, agent: int, iteration: int):
+        session_id = f"load-{agent}-{iteration}"
+        scripts = self.agent_dir / "scripts"
+        return [
+            ("gate", [sys.executable, str(scripts / "session_gate.py"), "--session-id", session_id]),
+            ("audit", [sys.executable, str(self.agent_dir / "bin" / "session-audit-log"), "--log",
+                       "--event", "LOAD_EVENT", "--session-id", session_id,
+                       "--details", f"agent={agent} iteration={iteration}"]),
+            ("add-step", self.ledger_cmd(agent, "add-step", TASK_ID,
+                                         f"load agent-{agent} step {iteration}", "ok")),
+            ("status", self.ledger_cmd(agent, "status")),
+        ]
+
+    def run_agent(self, agent: int, barrier: threading.Barrier):
+        barrier.wait()
+        for iteration in range(self.iterations):
+            for op, cmd in self.commands(agent, iteration):
+                start = time.perf_counter()
+                result = subprocess.run(cmd, env=self.env, cwd=self.facts["workspace"],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                        text=True)
+                record = {"agent": agent, "op": op,
+                          "ms": (time.perf_counter() - start) * 1000,
+                          "returncode": result.returncode}
+                if result.returncode != 0:
+                    record["stderr"] = result.stderr.strip()[-200:]
+                with self.records_lock:
+                    self.records.append(record)
+
+    def run(self) -> float:
+        """Run all agents concurrently; returns wall-clock seconds."""
+        barrier = threading.Barrier(self.agents)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.agents) as pool:
+            for future in [pool.submit(self.run_agent, a, barrier) for a in range(self.agents)]:
+                future.result()
+        return time.perf_counter() - start
+
+    # -- verification -----------------------------------------------------
+
+    def check_audit_log(self):
+        """Expected session/audit events missing from, or garbled in, session_audit.log."""
+        path = self.facts["home"] / ".agent" / "logs" / "session_audit.log"
+        seen = set()
+        corrupted = 0
+        with open(path) as f:
+            for line in f:
+                parts = line.rstrip("\n").split(" | ")
+                try:
+                    datetime.fromisoformat(parts[0].replace("Z", "+00:00"))
+                    if len(parts) < 6:
+                        raise ValueError
+                except ValueError:
+                    corrupted += 1
+                    continue
+                if parts[4].startswith("load-"):
+                    seen.add((parts[4], parts[1]))
+        expected = {(f"load-{a}-{i}", event)
+                    for a in range(self.agents) for i in range(self.iterations)
+                    for event in ("SESSION_START", "SESSION_INITIALIZED", "SESSION_END", "LOAD_EVENT")}
+        return {"expected": len(expected), "lost": len(expected - seen), "corrupted_lines": corrupted}
+
+    def check_compliance_log(self):
+        """Structured LOAD_EVENT entries lost by concurrent rewrites of compliance_log.json."""
+        path = self.facts["home"] / ".agent" / "logs" / "compliance_log.json"
+        expected = self.agents * self.iterations
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            return {"expected": expected, "lost": expected, "corrupted": True, "error": str(e)}
+        found = {e.get("session_id") for e in entries if e.get("event") == "LOAD_EVENT"}
+        return {"expected": expected, "lost": expected - len(found), "corrupted": False}
+
+    def check_ledgers(self):
+        """Recorded add-step entries versus the steps the agents were told to add."""
+        ledger_dir = self.agent_dir / "ledgers"
+        if self.per_agent_missions:
+            paths = [ledger_dir / "missions" / f"agent-{a}" / "progress_ledger.json"
+                     for a in range(self.agents)]
+        else:
+            paths = [ledger_dir / "progress_ledger.json"]
+
+        actions = []
+        corrupted = 0
+        duplicate_indexes = 0
+        for path in paths:
+            try:
+                with open(path) as f:
+                    steps = json.load(f)["steps"]
+            except (OSError, json.JSONDecodeError, KeyError):
+                corrupted += 1
+                continue
+            indexes = [s["index"] for s in steps]
+            duplicate_indexes += len(indexes) - len(set(indexes))
+            actions += [s["action"] for s in steps if s["action"].startswith("load ")]
+
+        expected = {f"load agent-{a} step {i}" for a in range(self.agents) for i in range(self.iterations)}
+        return {"expected": len(expected), "lost": len(expected - set(actions)),
+                "duplicated": len(actions) - len(set(actions)),
+                "duplicate_indexes": duplicate_indexes, "corrupted_files": corrupted}
+
+    def lock_waits(self):
+        """Ledger lock wait times (ms) recorded by ledger-manager spans."""
+        waits = []
+        if self.trace_file.exists():
+            with open(self.trace_file) as f:
+                for line in f:
+                    try:
+                        span = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    wait = span.get("attrs", {}).get("lock_wait_ms")
+                    if wait is not None and span["name"].startswith("ledger."):
+                        waits.append(wait)
+        return waits
+
+    def report(self, wall_s: float) -> dict:
+        latency = {}
+        for op in OPS:
+            times = [r["ms"] for r in self.records if r["op"] == op]
+            latency[op] = {
+                "count": len(times),
+                "p50_ms": round(percentile(times, 50), 1) if times else None,
+                "p95_ms": round(percentile(times, 95), 1) if times else None,
+                "p99_ms": round(percentile(times, 99), 1) if times else None,
+                "max_ms": round(max(times), 1) if times else None,
+            }
+        waits = self.lock_waits()
+        failures = [r for r in self.records if r["returncode"] != 0]
+        return {
+            "agents": self.agents,
+            "iterations": self.iterations,
+            "missions": "per-agent" if self.per_agent_missions else "shared",
+            "wall_s": round(wall_s, 2),
+            "throughput_ops_s": round(len(self.records) / wall_s, 1),
+            "sessions_per_s": round(self.agents * self.iterations / wall_s, 2),
+            "latency": latency,
+            "lock_wait_ms": {
+                "samples": len(waits),
+                "p50": round(percentile(waits, 50), 2) if waits else None,
+                "p95": round(percentile(waits, 95), 2) if waits else None,
+                "p99": round(percentile(waits, 99), 2) if waits else None,
+                "max": round(max(waits), 2) if waits else None,
+            },
+            "failed_commands": len(failures),
+            "failure_samples": [f.get("stderr", "") for f in failures[:3]],
+            "integrity": {
+                "audit_log": self.check_audit_log(),
+                "compliance_log": self.check_compliance_log(),
+                "ledger": self.check_ledgers(),
+            },
+        }
+
+
+def has_integrity_issues(report: dict) -> bool:
+    integrity = report["integrity"]
+    return bool(integrity["audit_log"]["lost"] or integrity["audit_log"]["corrupted_lines"]
+                or integrity["compliance_log"]["lost"] or integrity["compliance_log"]["corrupted"]
+                or integrity["ledger"]["lost"] or integrity["ledger"]["duplicated"]
+                or integrity["ledger"]["duplicate_indexes"] or integrity["ledger"]["corrupted_files"])
+
+
+def print_report(report: dict):
+    print(f"\n📈 {report['agents']} agents x {report['iterations']} sessions "
+          f"({report['missions']} ledger) in {report['wall_s']} s")
+    print(f"  Throughput: {report['throughput_ops_s']} ops/s, {report['sessions_per_s']} sessions/s")
+    if report["failed_commands"]:
+        print(f"  ⚠️  Failed commands: {report['failed_commands']}")
+        for sample in report["failure_samples"]:
+            print(f"     {sample}")
+
+    print("\n⏱️  Latency:")
+    for op, stats in report["latency"].items():
+        if stats["count"]:
+            print(f"  {op:<10} p50 {stats['p50_ms']:>8.1f}  p95 {stats['p95_ms']:>8.1f}  "
+                  f"p99 {stats['p99_ms']:>8.1f}  max {stats['max_ms']:>8.1f} ms  (n={stats['count']})")
+
+    waits = report["lock_wait_ms"]
+    if waits["samples"]:
+        print(f"\n🔒 Ledger lock wait: p50 {waits['p50']} ms  p95 {waits['p95']} ms  "
+              f"p99 {waits['p99']} ms  max {waits['max']} ms  (n={waits['samples']})")
+
+    print("\n🧪 Integrity:")
+    for name, result in report["integrity"].items():
+        problems = {k: v for k, v in result.items() if k != "expected" and v}
+        mark = "❌" if problems else "✅"
+        detail = ", ".join(f"{k}={v}" for k, v in problems.items()) or "no lost or corrupted writes"
+        print(f"  {mark} {name:<15} expected {result['expected']}: {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent agents sharing one ~/.agent")
+    parser.add_argument("--agents", type=int, default=50, help="Concurrent agents (default: 50)")
+    parser.add_argument("--iterations", type=int, default=2, help="Sessions per agent (default: 2)")
+    parser.add_argument("--missions", choices=["shared", "per-agent"], default="shared",
+                        help="One shared ledger, or one mission shard per agent (default: shared)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="load-sim-") as tmp:
+        sim = LoadSimulator(Path(tmp), args.agents, args.iterations, args.missions == "per-agent")
+        sim.setup()
+        if not args.json:
+            print(f"🚀 Starting {args.agents} agents...")
+        wall_s = sim.run()
+        report = sim.report(wall_s)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if has_integrity_issues(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Session Gate Latency Benchmark
+
+Compares the legacy shell gate (the pre-engine bin/agent-session-gate: the
+Orchestrator's check_protocol_compliance.py --init --turbo in its own
+interpreter, audit lines appended with echo) against the in-process gate
+engine (scripts/session_gate.py). Both run in a throwaway HOME against a
+generated workspace that passes the initialization checks, so the real
+audit trail is never touched.
+
+The legacy path needs the Orchestrator skill from your real
+~/.gemini/antigravity/skills/Orchestrator; it is copied into the throwaway
+HOME. Without it only the engine is timed.
+
+Usage:
+    python ~/.agent/benchmarks/bench_session_gate.py [--runs 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+AGENT_DIR = BENCH_DIR.parent
+SCRIPTS_DIR = AGENT_DIR / "scripts"
+sys.path.insert(0, str(BENCH_DIR))
+
+import generators
+
+ORCHESTRATOR_REL = Path(".gemini") / "antigravity" / "skills" / "Orchestrator"
+
+# The pre-engine gate, step for step (colors and banners dropped)
+LEGACY_GATE = r'''
+set -e
+AGENT_PROVIDER="${AGENT_PROVIDER:-unknown}"
+SESSION_ID="$(uuidgen 2>/dev/null || date +%s)-$$"
+TIMESTAMP="$(date -u +%Y-%m-%dT%H:%M:%SZ)"
+WORKSPACE="$(pwd)"
+AUDIT_DIR="$HOME/.agent/logs"
+mkdir -p "$AUDIT_DIR"
+AUDIT_LOG="$AUDIT_DIR/session_audit.log"
+log_event() {
+    echo "$TIMESTAMP | $1 | $AGENT_PROVIDER | $WORKSPACE | $SESSION_ID | $2" >> "$AUDIT_LOG"
+}
+cleanup() {
+    local exit_code=$?
+    if [ $exit_code -eq 0 ]; then
+        log_event "SESSION_END" "status=success"
+    else
+        log_event "SESSION_END" "status=failed exit_code=$exit_code"
+    fi
+    unset AGENT_SESSION_VALIDATED
+}
+trap cleanup EXIT
+log_event "SESSION_START" "provider=$AGENT_PROVIDER"
+if ! python3 "$HOME/.gemini/antigravity/skills/Orchestrator/scripts/check_protocol_compliance.py" --init --turbo; then
+    log_event "VALIDATION_FAILED" "orchestrator_init_failed"
+    exit 1
+fi
+if ! git rev-parse --git-dir > /dev/null 2>&1; then
+    log_event "WORKSPACE_WARNING" "not_git_repo"
+fi
+if [ ! -f ".agent/AGENTS.md" ] && [ ! -f "$HOME/.agent/AGENTS.md" ]; then
+    log_event "WORKSPACE_WARNING" "no_agents_md"
+fi
+export AGENT_SESSION_VALIDATED=true
+export AGENT_SESSION_ID="$SESSION_ID"
+export AGENT_PROVIDER="$AGENT_PROVIDER"
+log_event "SESSION_INITIALIZED" "status=ready"
+export AGENT_SESSION_INFO="provider=$AGENT_PROVIDER|session_id=$SESSION_ID|workspace=$WORKSPACE"
+'''
+
+
+def time_command(cmd, env, cwd, runs):
+    """Run cmd `runs` times and return wall-clock durations in ms."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, env=env, cwd=cwd, capture_output=True, text=True)
+        durations.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{cmd[0]} exited {result.returncode}: {result.stderr.strip()}")
+    return durations
+
+
+def summarize(durations):
+    """Min/median/p95 summary of a list of durations."""
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 2),
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(p95, 2),
+    }
+
+
+def run_benchmark(runs: int):
+    """Benchmark both gate paths in an isolated HOME; legacy is None without the Orchestrator."""
+    orchestrator = Path.home() / ORCHESTRATOR_REL
+    with tempfile.TemporaryDirectory(prefix="gate-bench-") as tmp:
+        home = Path(tmp) / "home"
+        home.mkdir()
+        workspace = generators.project(Path(tmp) / "project")
+        env = dict(os.environ, HOME=str(home), PATH=generators.tool_shims(Path(tmp) / "tools"),
+                   AGENT_PROVIDER="bench")
+        cwd = str(workspace)
+
+        engine_cmd = [sys.executable, str(SCRIPTS_DIR / "session_gate.py")]
+        legacy_cmd = None
+        if orchestrator.is_dir():
+            shutil.copytree(orchestrator, home / ORCHESTRATOR_REL)
+            legacy_cmd = ["bash", "-c", LEGACY_GATE]
+
+        # Warm the filesystem cache so the first run is not an outlier
+        time_command(engine_cmd, env, cwd, 1)
+        engine = summarize(time_command(engine_cmd, env, cwd, runs))
+        legacy = None
+        if legacy_cmd:
+            time_command(legacy_cmd, env, cwd, 1)
+            legacy = summarize(time_command(legacy_cmd, env, cwd, runs))
+
+    return {
+        "legacy_shell_gate": legacy,
+        "in_process_gate": engine,
+        "speedup_median": round(legacy["median_ms"] / engine["median_ms"], 2) if legacy else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session gate latency")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per gate path (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("⏱️  Session Gate Latency")
+    print("=" * 50)
+    for name in ("legacy_shell_gate", "in_process_gate"):
+        r = results[name]
+        if r is None:
+            print(f"  {name:<18} skipped: Orchestrator skill not installed at ~/{ORCHESTRATOR_REL}")
+            continue
+        print(f"  {name:<18} min {r['min_ms']:>8.1f} ms | median {r['median_ms']:>8.1f} ms"
+              f" | p95 {r['p95_ms']:>8.1f} ms")
+    if results["speedup_median"] is not None:
+        print(f"\n  Speedup (median): {results['speedup_median']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
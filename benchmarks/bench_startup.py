@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+CLI Startup-Time Benchmark
+
+Runs each harness CLI under `python3 -X importtime`, sums the per-module
+import times and checks them against startup_budget.json. A scenario fails
+when its best-of-N import time exceeds the budget or when it imports a module
+it must not need (e.g. pydantic for read-only commands).
+
+Usage:
+    python ~/.agent/benchmarks/bench_startup.py [--runs 5] [--json] [--update-budget]
+
+Exit codes:
+    0: All scenarios within budget
+    1: Budget regression
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+
+# name -> (argv relative to the sandbox, cwd relative to the sandbox)
+SCENARIOS = {
+    "ledger-status": (["ledgers/ledger-manager.py", "status"], "."),
+    "ledger-as-of": (["ledgers/ledger-manager.py", "as-of", "0"], "."),
+    "ledger-add-step": (["ledgers/ledger-manager.py", "add-step", "bench", "Bench step", "ok"], "."),
+    "audit-log-append": (["bin/session-audit-log", "--log", "--event", "BENCH"], "."),
+    "audit-report": (["bin/session-audit-log", "--report"], "."),
+    "todo-enforcer": (["scripts/todo-enforcer.py"], "."),
+    "import-compliance-validators": (["-c", "import compliance_validators"], "scripts"),
+    "session-gate": (["scripts/session_gate.py"], "."),
+}
+
+# Budget headroom applied by --update-budget on top of the measured time
+BUDGET_HEADROOM = 3.0
+
+
+def build_sandbox(root: Path):
+    """Copy the harness code and ledgers into a throwaway tree."""
+    for sub in ("bin", "scripts", "ledgers"):
+        shutil.copytree(AGENT_DIR / sub, root / sub,
+                        ignore=shutil.ignore_patterns("__pycache__", "checkpoints"))
+    (root / "home").mkdir()
+
+
+def import_profile(stderr: str):
+    """Parse -X importtime output into (total_ms, set of top-level modules)."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        total_us += int(parts[0])
+        modules.add(parts[2].strip().split(".")[0])
+    return total_us / 1000, modules
+
+
+def measure(name: str, root: Path, runs: int):
+    """Best-of-N import time (ms) and imported modules for one scenario.
+
+    The minimum is used rather than the median: it is the least sensitive to
+    scheduler and disk-cache noise, which is what a budget check needs.
+    """
+    argv, cwd = SCENARIOS[name]
+    argv = [a if a.startswith("-") or "/" not in a else str(root / a) for a in argv]
+    env = dict(os.environ, HOME=str(root / "home"), AGENT_PROVIDER="bench")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+
+    timings = []
+    modules = set()
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", *argv],
+                                cwd=root / cwd, env=env, capture_output=True, text=True)
+        total_ms, mods = import_profile(result.stderr)
+        timings.append(total_ms)
+        modules |= mods
+    return round(min(timings), 2), modules
+
+
+def load_budget():
+    if not BUDGET_PATH.exists():
+        return {}
+    with open(BUDGET_PATH) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup import time")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (default: 5)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Only run the given scenario(s)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--update-budget", action="store_true",
+                        help=f"Rewrite max_import_ms as {BUDGET_HEADROOM}x the measured time")
+    args = parser.parse_args()
+
+    budget = load_budget()
+    results = {}
+    failures = []
+
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as tmp:
+        root = Path(tmp)
+        build_sandbox(root)
+        for name in args.scenario or SCENARIOS:
+            import_ms, modules = measure(name, root, args.runs)
+            limits = budget.get(name, {})
+            forbidden = sorted(set(limits.get("forbid", [])) & modules)
+            max_ms = limits.get("max_import_ms")
+            over = max_ms is not None and import_ms > max_ms
+            results[name] = {
+                "import_ms": import_ms,
+                "budget_ms": max_ms,
+                "forbidden_imported": forbidden,
+                "passed": not over and not forbidden,
+            }
+            if over:
+                failures.append(f"{name}: {import_ms} ms > budget {max_ms} ms")
+            if forbidden:
+                failures.append(f"{name}: imports forbidden module(s) {', '.join(forbidden)}")
+
+    if args.update_budget:
+        for name, r in results.items():
+            entry = budget.setdefault(name, {"forbid": []})
+            entry["max_import_ms"] = round(r["import_ms"] * BUDGET_HEADROOM, 1)
+        with open(BUDGET_PATH, "w") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("⏱️  CLI Startup Import Time")
+        print("=" * 60)
+        for name, r in results.items():
+            mark = "✅" if r["passed"] else "❌"
+            budget_str = f"{r['budget_ms']} ms" if r["budget_ms"] is not None else "-"
+            print(f"  {mark} {name:<30} {r['import_ms']:>8.1f} ms  (budget {budget_str})")
+        if args.update_budget:
+            print(f"\n✅ Updated budget: {BUDGET_PATH}")
+        elif failures:
+            print(f"\n🚨 BUDGET REGRESSIONS ({len(failures)}):")
+            for failure in failures:
+                print(f"  - {failure}")
+
+    return 1 if failures and not args.update_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Deterministic data generators for the harness benchmarks.
+
+Each generator builds one data shape that grows outside the harness's
+control, seeded so the same scale always produces the same data (audit log
+timestamps are anchored to the current time so report windows include them):
+
+    ledger          task/progress ledgers with N steps (plus checkpoints)
+    step_batch      a JSONL batch of N steps for ledger-manager add-steps
+    audit_log       ~/.agent/logs/session_audit.log with N sessions
+    brain_sessions  N ~/.gemini/antigravity/brain/<uuid>/ dirs with task.md
+    gemini_tree     a ~/.gemini tree of N files (walked by SOPValidator)
+    project         a workspace that passes the initialization checks
+
+SCALES maps a scale name to the size of each shape. build_home() lays all
+of them out under a throwaway HOME next to a copy of the harness code.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+
+# Fixed epoch so generated timestamps (and therefore files) are reproducible
+EPOCH = datetime(2026, 1, 1)
+
+SCALES = {
+    "small": {"steps": 100, "sessions": 100, "brain_dirs": 10, "gemini_files": 100},
+    "medium": {"steps": 2000, "sessions": 2000, "brain_dirs": 100, "gemini_files": 2000},
+    "large": {"steps": 20000, "sessions": 20000, "brain_dirs": 1000, "gemini_files": 20000},
+}
+
+PROVIDERS = ["gemini", "claude", "opencode", "codex"]
+STATUSES = ["success"] * 8 + ["failure", "stall"]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def ledger(ledger_dir: Path, steps: int, tasks: int = 20, checkpoints: int = 10, seed: int = 1):
+    """Write task_ledger.json / progress_ledger.json in the ledger_schemas shape."""
+    rng = random.Random(seed)
+    ledger_dir.mkdir(parents=True, exist_ok=True)
+    task_ids = [f"task-{i}" for i in range(tasks)]
+    task_data = {
+        "mission_id": "bench-mission",
+        "mission_description": "Synthetic benchmark mission",
+        "goals": ["benchmark"],
+        "tasks": [{
+            "id": task_id,
+            "description": f"Synthetic task {task_id}",
+            "status": "completed" if i < tasks // 2 else "open",
+            "priority": rng.choice(["P0", "P1", "P2", "P3"]),
+            "dependencies": [],
+            "facts": [],
+            "guesses": [],
+            "created_at": str(EPOCH),
+            "updated_at": str(EPOCH),
+        } for i, task_id in enumerate(task_ids)],
+        "metadata": {},
+    }
+    progress_data = {
+        "mission_id": "bench-mission",
+        "steps": [{
+            "index": i,
+            "task_id": rng.choice(task_ids),
+            "action": f"Step {i}: apply change",
+            "outcome": "done" if i % 7 else "Task completed",
+            "status": rng.choice(STATUSES),
+            "timestamp": str(EPOCH + timedelta(seconds=30 * i)),
+            "observed_state": {},
+        } for i in range(steps)],
+        "current_step_index": max(0, steps - 1),
+        "stalls_detected": 0,
+        "replan_history": [],
+    }
+    with open(ledger_dir / "task_ledger.json", "w") as f:
+        json.dump(task_data, f, indent=2)
+    with open(ledger_dir / "progress_ledger.json", "w") as f:
+        json.dump(progress_data, f, indent=2)
+
+    # Evenly spaced manual checkpoints with truncated step prefixes
+    checkpoint_dir = ledger_dir / "checkpoints"
+    checkpoint_dir.mkdir(exist_ok=True)
+    for n in range(1, checkpoints + 1):
+        upto = steps * n // (checkpoints + 1)
+        ts = EPOCH + timedelta(seconds=30 * upto)
+        cp_id = f"cp_{ts.strftime('%Y%m%d_%H%M%S')}"
+        checkpoint = {
+            "checkpoint_id": cp_id,
+            "timestamp": str(ts),
+            "task_ledger": task_data,
+            "progress_ledger": dict(progress_data, steps=progress_data["steps"][:upto]),
+            "reason": "bench",
+        }
+        with open(checkpoint_dir / f"{cp_id}.json", "w") as f:
+            json.dump(checkpoint, f)
+    return task_data, progress_data
+
+
+def step_batch(path: Path, steps: int, tasks: int = 20, seed: int = 5):
+    """Write a JSONL batch of steps against the ledger() tasks."""
+    rng = random.Random(seed)
+    start = EPOCH + timedelta(seconds=30 * steps)
+    with open(path, "w") as f:
+        for i in range(steps):
+            f.write(json.dumps({
+                "task_id": f"task-{rng.randrange(tasks)}",
+                "action": f"Replayed step {i}",
+                "outcome": "done" if i % 7 else "Task completed",
+                "status": rng.choice(STATUSES),
+                "timestamp": str(start + timedelta(seconds=30 * i)),
+            }) + "\n")
+    return path
+
+
+def audit_log(home: Path, sessions: int, seed: int = 2):
+    """Write a session_audit.log; returns one session id for --check."""
+    rng = random.Random(seed)
+    log_dir = home / ".agent" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    # Recent timestamps so --report/--timings windows include the data
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(days=6)
+    spacing = timedelta(days=6) / max(1, sessions)
+    lines = []
+    session_id = None
+    for i in range(sessions):
+        session_id = f"{_uuid(rng).upper()}-{1000 + i}"
+        provider = rng.choice(PROVIDERS)
+        workspace = f"/work/project-{rng.randrange(10)}"
+        t = start + spacing * i
+        events = [("SESSION_START", f"provider={provider}"),
+                  ("SESSION_INITIALIZED", "status=ready")]
+        if rng.random() < 0.05:
+            events.insert(1, ("VALIDATION_FAILED", "orchestrator_init_failed"))
+        if rng.random() < 0.97:
+            events.append(("SESSION_END", "status=success"))
+        for n, (event, details) in enumerate(events):
+            ts = (t + timedelta(milliseconds=250 * n)).isoformat() + "Z"
+            lines.append(f"{ts} | {event} | {provider} | {workspace} | {session_id} | {details}\n")
+    with open(log_dir / "session_audit.log", "w") as f:
+        f.writelines(lines)
+    return session_id
+
+
+def brain_sessions(home: Path, count: int, seed: int = 3):
+    """Create brain session dirs; only the oldest one holds a task.md.
+
+    find_task_md() and check_approval() therefore scan every directory,
+    which is the worst case the benchmark is meant to expose.
+    """
+    rng = random.Random(seed)
+    brain = home / ".gemini" / "antigravity" / "brain"
+    brain.mkdir(parents=True, exist_ok=True)
+    base = EPOCH.timestamp()
+    for i in range(count):
+        session = brain / _uuid(rng)
+        session.mkdir()
+        (session / "implementation_plan.md").write_text(f"# Plan {i}\n")
+        if i == 0:
+            (session / "task.md").write_text("# Task\n\n## Approval\n\n- [x] done\n- [ ] pending\n")
+        os.utime(session, (base + i, base + i))
+
+
+def gemini_tree(home: Path, files: int, fanout: int = 20, seed: int = 4):
+    """Fill ~/.gemini with a nested tree of `files` small files."""
+    rng = random.Random(seed)
+    root = home / ".gemini"
+    root.mkdir(parents=True, exist_ok=True)
+    for name in ("AGENT_ONBOARDING.md", "GEMINI.md", "GLOBAL_INDEX.md"):
+        (root / name).write_text(f"# {name}\n")
+    for i in range(files):
+        depth = rng.randrange(1, 4)
+        parts = [f"d{rng.randrange(fanout)}" for _ in range(depth)]
+        directory = root.joinpath("tree", *parts)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"f{i}.md").write_text("x\n")
+
+
+def project(root: Path):
+    """A git workspace with .agent/.beads, planning docs and a fresh approval,
+    so every SOP check runs and the session gate clears."""
+    agent = root / ".agent"
+    for sub in ("rules", "skills", "docs", "scripts", "session_locks"):
+        (agent / sub).mkdir(parents=True, exist_ok=True)
+    (root / ".beads").mkdir(exist_ok=True)
+    (agent / "rules" / "ROADMAP.md").write_text("# Roadmap\n")
+    (agent / "rules" / "ImplementationPlan.md").write_text("# Plan\n")
+    (agent / "task.md").write_text("# Task\n\n## Approval\n\n- [x] APPROVED FOR EXECUTION\n")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    return root
+
+
+def tool_shims(bin_dir: Path) -> str:
+    """No-op executables for required gate tools missing on this machine;
+    returns a PATH with bin_dir first."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for tool in ("bd", "uv"):
+        if shutil.which(tool) is None:
+            shim = bin_dir / tool
+            shim.write_text("#!/bin/sh\nexit 0\n")
+            shim.chmod(0o755)
+    return f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+
+def build_home(root: Path, scale: str) -> dict:
+    """Lay out a full benchmark HOME for one scale; returns generated facts."""
+    sizes = SCALES[scale]
+    home = root / "home"
+    agent = home / ".agent"
+    for sub in ("bin", "scripts", "ledgers"):
+        shutil.copytree(AGENT_DIR / sub, agent / sub,
+                        ignore=shutil.ignore_patterns("__pycache__", "checkpoints", "missions",
+                                                      "*.json", ".lock"))
+    if (AGENT_DIR / "AGENTS.md").exists():
+        shutil.copy(AGENT_DIR / "AGENTS.md", agent / "AGENTS.md")
+
+    ledger(agent / "ledgers", sizes["steps"])
+    checkpoint_ids = sorted(p.stem for p in (agent / "ledgers" / "checkpoints").glob("cp_*.json"))
+    batch = step_batch(root / "steps.jsonl", sizes["steps"])
+    session_id = audit_log(home, sizes["sessions"])
+    gemini_tree(home, sizes["gemini_files"])
+    brain_sessions(home, sizes["brain_dirs"])
+    workspace = project(root / "project")
+    path = tool_shims(root / "tools")
+    return {"home": home, "agent": agent, "workspace": workspace,
+            "session_id": session_id, "sizes": sizes, "step_batch": batch, "path": path,
+            "checkpoint_id": checkpoint_ids[len(checkpoint_ids) // 2]}
@@ -0,0 +1,186 @@
+"""
+Automatic checkpoint policies, background checkpoint writes and retention.
+
+Policy (checkpoint_policy.json in the ledger state directory):
+
+    every_n_steps       checkpoint when the step count crosses a multiple of N (0 = off)
+    every_minutes       checkpoint when the newest checkpoint is older than T (0 = off)
+    on_task_completion  checkpoint after a step or command completes a task
+    before_failure      checkpoint the state *before* recording a status="failure" step
+    retention           keep_last K auto checkpoints, plus the newest one per hour
+                        for hourly_for_hours and per day for daily_for_days
+
+Auto checkpoints are written off the caller's path: a detached grandchild
+process serializes its copy-on-write (and therefore immutable) copy of the
+ledgers while the command returns. Like the ledger locks (fcntl), this
+needs a POSIX system. Background write failures are appended to logs/checkpoint_errors.log.
+Set AGENT_CHECKPOINT_SYNC=1 to write inline (tests, debugging).
+
+Retention only ever prunes auto checkpoints (cp_*_auto.json); manual
+checkpoints are kept.
+"""
+
+import json
+import os
+import sys
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ledger_history import checkpoint_index
+
+POLICY_NAME = "checkpoint_policy.json"
+AUTO_SUFFIX = "_auto"
+ERROR_LOG = Path(__file__).resolve().parent.parent / "logs" / "checkpoint_errors.log"
+
+DEFAULT_POLICY = {
+    "every_n_steps": 50,
+    "every_minutes": 0,
+    "on_task_completion": True,
+    "before_failure": True,
+    "retention": {
+        "keep_last": 20,
+        "hourly_for_hours": 24,
+        "daily_for_days": 30,
+    },
+}
+
+
+def load_policy(state_dir):
+    """Policy for a ledger state directory, merged over the defaults."""
+    policy = json.loads(json.dumps(DEFAULT_POLICY))
+    path = Path(state_dir) / POLICY_NAME
+    if path.exists():
+        with open(path) as f:
+            stored = json.load(f)
+        policy["retention"].update(stored.pop("retention", {}))
+        policy.update(stored)
+    return policy
+
+
+def save_policy(state_dir, policy):
+    path = Path(state_dir) / POLICY_NAME
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(policy, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def due_reason(policy, checkpoint_dir, steps_before, steps_after, completed_tasks=(), now=None):
+    """Name of the first post-write policy trigger that fired, or None."""
+    if policy["on_task_completion"] and completed_tasks:
+        return "task_completed"
+
+    every = policy["every_n_steps"]
+    if every and steps_after // every > steps_before // every:
+        return f"every_{every}_steps"
+
+    minutes = policy["every_minutes"]
+    if minutes and steps_after > steps_before:
+        index = checkpoint_index(checkpoint_dir)
+        now = now or datetime.utcnow()
+        if not index or now - index[-1][0] >= timedelta(minutes=minutes):
+            return f"every_{minutes}_minutes"
+    return None
+
+
+def new_checkpoint(task_data, progress_data, reason, now=None):
+    """Plain-dict checkpoint in the same shape as ledger_schemas.Checkpoint."""
+    now = now or datetime.utcnow()
+    return {
+        "checkpoint_id": f"cp_{now.strftime('%Y%m%d_%H%M%S_%f')}{AUTO_SUFFIX}",
+        "timestamp": str(now),
+        "task_ledger": task_data,
+        "progress_ledger": progress_data,
+        "reason": f"auto:{reason}",
+    }
+
+
+def prune(checkpoint_dir, retention, now=None):
+    """Delete auto checkpoints outside the retention policy; returns removed ids."""
+    now = now or datetime.utcnow()
+    auto = [(ts, cp_id) for ts, cp_id in checkpoint_index(checkpoint_dir)
+            if cp_id.endswith(AUTO_SUFFIX)]
+    keep = {cp_id for _, cp_id in auto[-retention["keep_last"]:]} if retention["keep_last"] else set()
+
+    # Newest checkpoint per hour / per day bucket inside the thinning windows
+    hourly_cutoff = now - timedelta(hours=retention["hourly_for_hours"])
+    daily_cutoff = now - timedelta(days=retention["daily_for_days"])
+    seen_hours, seen_days = set(), set()
+    for ts, cp_id in reversed(auto):
+        if ts >= hourly_cutoff and ts.strftime("%Y%m%d%H") not in seen_hours:
+            seen_hours.add(ts.strftime("%Y%m%d%H"))
+            keep.add(cp_id)
+        if ts >= daily_cutoff and ts.strftime("%Y%m%d") not in seen_days:
+            seen_days.add(ts.strftime("%Y%m%d"))
+            keep.add(cp_id)
+
+    removed = []
+    for _, cp_id in auto:
+        if cp_id not in keep:
+            try:
+                (Path(checkpoint_dir) / f"{cp_id}.json").unlink()
+                removed.append(cp_id)
+            except FileNotFoundError:
+                pass  # pruned concurrently by another writer
+    return removed
+
+
+def write_checkpoint(checkpoint_dir, checkpoint, retention=None):
+    """Serialize a checkpoint atomically, then apply retention."""
+    checkpoint_dir = Path(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_dir / f"{checkpoint['checkpoint_id']}.json"
+    tmp_path = checkpoint_dir / f".{path.name}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    if retention:
+        prune(checkpoint_dir, retention)
+
+
+def write_checkpoint_logged(checkpoint_dir, checkpoint, retention=None):
+    """write_checkpoint for background writers; failures go to ERROR_LOG."""
+    try:
+        write_checkpoint(checkpoint_dir, checkpoint, retention)
+        return True
+    except Exception:
+        try:
+            ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+            with open(ERROR_LOG, "a") as f:
+                f.write(f"{datetime.utcnow().isoformat()}Z | {checkpoint['checkpoint_id']} | "
+                        f"{checkpoint_dir}\n{traceback.format_exc()}\n")
+        except OSError:
+            pass
+        return False
+
+
+def submit_checkpoint(checkpoint_dir, checkpoint, retention=None):
+    """Write a checkpoint without blocking the caller.
+
+    The caller hands over `checkpoint` and must not mutate it afterwards.
+    Background write failures are logged to ERROR_LOG, not raised.
+    """
+    if os.environ.get("AGENT_CHECKPOINT_SYNC"):
+        write_checkpoint(checkpoint_dir, checkpoint, retention)
+        return
+
+    # Double fork: the grandchild is reparented to init (no zombie) and holds
+    # a copy-on-write snapshot; this process only waits for the short-lived child.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            if os.fork() == 0:
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                ok = False
+                try:
+                    ok = write_checkpoint_logged(checkpoint_dir, checkpoint, retention)
+                finally:
+                    os._exit(0 if ok else 1)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
@@ -1,26 +1,78 @@
 #!/usr/bin/env python3
 import json
 import argparse
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from ledger_schemas import TaskLedger, ProgressLedger, TaskEntry, ProgressStep, Checkpoint
+from ledger_history import ROLLBACKS_KEY, completes_task, state_as_of
+import checkpoint_policy
+import mission_registry
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import harness_trace
+
+# ledger_schemas (and with it pydantic) is imported inside the commands that
+# validate models, so read-only commands such as `status` start fast.
 
 LEDGER_DIR = Path(__file__).parent
-TASK_LEDGER_PATH = LEDGER_DIR / "task_ledger.json"
-PROGRESS_LEDGER_PATH = LEDGER_DIR / "progress_ledger.json"
 
+# Ledger state location. Defaults to the single legacy ledger next to this
+# script; --mission (or $AGENT_MISSION_ID) switches to that mission's shard.
+STATE_DIR = LEDGER_DIR
+TASK_LEDGER_PATH = STATE_DIR / "task_ledger.json"
+PROGRESS_LEDGER_PATH = STATE_DIR / "progress_ledger.json"
+CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+
+# Commands that rewrite ledger files; they run under the state directory lock.
+# "policy" only writes when one of its update options is given.
+MUTATING_COMMANDS = {"init", "add-task", "add-step", "add-steps", "import",
+                     "complete-task", "checkpoint", "rollback", "policy"}
+# policy key -> `policy` option dest
+POLICY_OPTIONS = {
+    "every_n_steps": "every_steps",
+    "every_minutes": "every_minutes",
+    "on_task_completion": "on_completion",
+    "before_failure": "before_failure",
+}
+RETENTION_OPTIONS = {
+    "keep_last": "keep_last",
+    "hourly_for_hours": "hourly_hours",
+    "daily_for_days": "daily_days",
+}
+
+def select_mission(mission_id):
+    """Point all ledger paths at the shard for mission_id."""
+    global STATE_DIR, TASK_LEDGER_PATH, PROGRESS_LEDGER_PATH, CHECKPOINT_DIR
+    STATE_DIR = mission_registry.mission_dir(LEDGER_DIR, mission_id)
+    TASK_LEDGER_PATH = STATE_DIR / "task_ledger.json"
+    PROGRESS_LEDGER_PATH = STATE_DIR / "progress_ledger.json"
+    CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+
+def refresh_index(mission_id):
+    """Record the selected mission's status counts and activity in the index."""
+    summary = mission_registry.summarize(load_json(TASK_LEDGER_PATH), load_json(PROGRESS_LEDGER_PATH))
+    mission_registry.update_index(LEDGER_DIR, mission_id, summary)
+
+@harness_trace.traced("ledger.load_json")
 def load_json(path):
     if not path.exists():
         return None
     with open(path) as f:
         return json.load(f)
 
+@harness_trace.traced("ledger.save_json")
 def save_json(path, data):
-    with open(path, "w") as f:
+    # Write to a sibling temp file and rename so readers never see a
+    # half-written ledger.
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
         json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
 
 def init_ledgers(mission_id, description, goals):
+    from ledger_schemas import TaskLedger, ProgressLedger
+
     task_ledger = TaskLedger(
         mission_id=mission_id,
         mission_description=description,
@@ -31,11 +83,14 @@ def init_ledgers(mission_id, description, goals):
         mission_id=mission_id,
         steps=[]
     )
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
     save_json(TASK_LEDGER_PATH, task_ledger.model_dump())
     save_json(PROGRESS_LEDGER_PATH, progress_ledger.model_dump())
     print(f"✅ Initialized ledgers for mission: {mission_id}")
 
 def add_task(task_id, description, priority="P2", dependencies=None):
+    from ledger_schemas import TaskLedger, TaskEntry
+
     data = load_json(TASK_LEDGER_PATH)
     if not data:
         print("❌ Task ledger not initialized.")
@@ -52,6 +107,8 @@ def add_task(task_id, description, priority="P2", dependencies=None):
     print(f"✅ Added task: {task_id}")
 
 def add_step(task_id, action, outcome, status="success"):
+    from ledger_schemas import ProgressLedger, ProgressStep
+
     # Update progress
     p_data = load_json(PROGRESS_LEDGER_PATH)
     if not p_data:
@@ -65,17 +122,126 @@ def add_step(task_id, action, outcome, status="success"):
         outcome=outcome,
         status=status
     )
+    policy = checkpoint_policy.load_policy(STATE_DIR)
+    if status == "failure" and policy["before_failure"]:
+        auto_checkpoint(policy, "before_failure", progress_data=p_data)
+
     p_ledger.steps.append(step)
     p_ledger.current_step_index = step.index
-    save_json(PROGRESS_LEDGER_PATH, p_ledger.model_dump())
+    p_dump = p_ledger.model_dump()
+    save_json(PROGRESS_LEDGER_PATH, p_dump)
     
     # Also update task status in task ledger if completed
-    if status == "success" and "completed" in outcome.lower():
+    completed = completes_task(status, outcome)
+    if completed:
         update_task_status(task_id, "completed")
     
     print(f"✅ Recorded step for task: {task_id}")
+    maybe_auto_checkpoint(policy, step.index, step.index + 1, [task_id] if completed else [], p_dump)
+
+@harness_trace.traced("ledger.auto_checkpoint")
+def auto_checkpoint(policy, reason, task_data=None, progress_data=None):
+    """Snapshot the ledgers in the background; the caller does not wait on I/O.
+
+    Dicts passed in are handed over to the writer and must not be mutated.
+    """
+    checkpoint = checkpoint_policy.new_checkpoint(
+        task_data or load_json(TASK_LEDGER_PATH),
+        progress_data or load_json(PROGRESS_LEDGER_PATH),
+        reason,
+    )
+    checkpoint_policy.submit_checkpoint(CHECKPOINT_DIR, checkpoint, policy["retention"])
+    print(f"💾 Auto checkpoint ({reason}): {checkpoint['checkpoint_id']}")
+
+def maybe_auto_checkpoint(policy, steps_before, steps_after, completed_tasks, progress_data=None):
+    """Run the post-write policy triggers and checkpoint if one fired."""
+    reason = checkpoint_policy.due_reason(policy, CHECKPOINT_DIR, steps_before, steps_after,
+                                          completed_tasks)
+    if reason:
+        auto_checkpoint(policy, reason, progress_data=progress_data)
+
+def read_step_records(source):
+    """Read step records from a JSONL file, or stdin when source is '-'."""
+    f = sys.stdin if source == "-" else open(source)
+    try:
+        records = []
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append((line_no, json.loads(line)))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {line_no}: invalid JSON ({e.msg})")
+        return records
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def add_steps(source):
+    """Append many steps in one transaction: one validation pass, one write per ledger.
+
+    Returns False when the batch is rejected and nothing was recorded.
+    """
+    from pydantic import ValidationError
+    from ledger_schemas import TaskLedger, ProgressLedger, ProgressStep
+
+    p_data = load_json(PROGRESS_LEDGER_PATH)
+    if not p_data:
+        print("❌ Progress ledger not initialized.")
+        return False
+    try:
+        records = read_step_records(source)
+    except FileNotFoundError:
+        print(f"❌ Steps file not found: {source}")
+        return False
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read steps: {e}")
+        return False
+
+    p_ledger = ProgressLedger(**p_data)
+    start = len(p_ledger.steps)
+    new_steps = []
+    for offset, (line_no, record) in enumerate(records):
+        try:
+            new_steps.append(ProgressStep(**{**record, "index": start + offset}))
+        except (TypeError, ValidationError) as e:
+            print(f"❌ Invalid step on line {line_no}; no steps were recorded.\n{e}")
+            return False
+    if not new_steps:
+        print("⚠️  No steps to record.")
+        return True
+
+    policy = checkpoint_policy.load_policy(STATE_DIR)
+    if policy["before_failure"] and any(s.status == "failure" for s in new_steps):
+        auto_checkpoint(policy, "before_failure", progress_data=p_data)
+
+    p_ledger.steps.extend(new_steps)
+    p_ledger.current_step_index = new_steps[-1].index
+    p_dump = p_ledger.model_dump()
+    save_json(PROGRESS_LEDGER_PATH, p_dump)
+
+    # Derived task completions, applied to the task ledger in a single write
+    completed = {s.task_id for s in new_steps if completes_task(s.status, s.outcome)}
+    t_data = load_json(TASK_LEDGER_PATH) if completed else None
+    if t_data:
+        t_ledger = TaskLedger(**t_data)
+        now = datetime.utcnow()
+        for task in t_ledger.tasks:
+            if task.id in completed:
+                task.status = "completed"
+                task.updated_at = now
+        save_json(TASK_LEDGER_PATH, t_ledger.model_dump())
+
+    print(f"✅ Recorded {len(new_steps)} step(s) across {len({s.task_id for s in new_steps})} task(s)")
+    if completed:
+        print(f"   Completed task(s): {', '.join(sorted(completed))}")
+    maybe_auto_checkpoint(policy, start, start + len(new_steps), completed, p_dump)
+    return True
 
 def update_task_status(task_id, status):
+    from ledger_schemas import TaskLedger
+
     data = load_json(TASK_LEDGER_PATH)
     if not data:
         return
@@ -90,13 +256,18 @@ def update_task_status(task_id, status):
 def complete_task(task_id):
     update_task_status(task_id, "completed")
     print(f"✅ Task marked as completed: {task_id}")
+    policy = checkpoint_policy.load_policy(STATE_DIR)
+    if policy["on_task_completion"]:
+        auto_checkpoint(policy, "task_completed")
 
 def create_checkpoint(reason="manual"):
+    from ledger_schemas import TaskLedger, ProgressLedger, Checkpoint
+
     t_data = load_json(TASK_LEDGER_PATH)
     p_data = load_json(PROGRESS_LEDGER_PATH)
     if not t_data or not p_data:
         print("❌ Ledgers not initialized.")
-        return
+        return False
     
     t_ledger = TaskLedger(**t_data)
     p_ledger = ProgressLedger(**p_data)
@@ -109,12 +280,45 @@ def create_checkpoint(reason="manual"):
         reason=reason
     )
     
-    cp_path = LEDGER_DIR / f"checkpoints/{checkpoint_id}.json"
-    cp_path.parent.mkdir(exist_ok=True)
-    save_json(cp_path, checkpoint.model_dump())
+    # Written inline so the id printed below can be rolled back to at once
+    try:
+        checkpoint_policy.write_checkpoint(CHECKPOINT_DIR, checkpoint.model_dump())
+    except OSError as e:
+        print(f"❌ Could not write checkpoint {checkpoint_id}: {e}")
+        return False
     print(f"✅ Created checkpoint: {checkpoint_id}")
+    return True
+
+def configure_policy(args):
+    """Show the auto-checkpoint policy, applying any options given."""
+    policy = checkpoint_policy.load_policy(STATE_DIR)
+    updates = {key: getattr(args, dest) for key, dest in POLICY_OPTIONS.items()}
+    retention_updates = {key: getattr(args, dest) for key, dest in RETENTION_OPTIONS.items()}
+    changed = False
+    for key, value in updates.items():
+        if value is not None:
+            policy[key] = value
+            changed = True
+    for key, value in retention_updates.items():
+        if value is not None:
+            policy["retention"][key] = value
+            changed = True
+    if changed:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        checkpoint_policy.save_policy(STATE_DIR, policy)
+        print("✅ Updated auto-checkpoint policy")
+    print(json.dumps(policy, indent=2))
+
+def is_mutating(args):
+    """True when the command rewrites ledger files and needs the lock."""
+    if args.command == "policy":
+        dests = list(POLICY_OPTIONS.values()) + list(RETENTION_OPTIONS.values())
+        return any(getattr(args, dest) is not None for dest in dests)
+    return args.command in MUTATING_COMMANDS
 
 def resume_mission():
+    from ledger_schemas import TaskLedger, ProgressLedger
+
     t_data = load_json(TASK_LEDGER_PATH)
     p_data = load_json(PROGRESS_LEDGER_PATH)
     if not t_data or not p_data:
@@ -142,21 +346,85 @@ def resume_mission():
     else:
         print("📋 All currently tasks marked as completed or in progress.")
 
+def show_as_of(target, as_json=False):
+    """Print the reconstructed state at a timestamp or step index (read-only)."""
+    t_data = load_json(TASK_LEDGER_PATH)
+    p_data = load_json(PROGRESS_LEDGER_PATH)
+    if not t_data or not p_data:
+        print("❌ Ledgers not initialized.")
+        return
+
+    try:
+        target = int(target) if target.isdigit() else target
+        state = state_as_of(t_data, p_data, CHECKPOINT_DIR, target)
+    except ValueError as e:
+        print(f"❌ Invalid as-of target: {e}")
+        return
+
+    if as_json:
+        print(json.dumps(state, indent=2, default=str))
+        return
+
+    print(f"🕰️  Mission {t_data['mission_id']} as of {state['as_of']}")
+    if state["checkpoint_id"]:
+        print(f"   Baseline checkpoint: {state['checkpoint_id']}")
+    print(f"   Steps recorded: {state['step_count']}")
+    print(f"   Tasks completed: {state['completed_tasks']}/{len(state['tasks'])}")
+    print("\nTasks:")
+    for t in state["tasks"]:
+        print(f"  [{t['status']}] {t['id']}: {t['description']}")
+    last = state["last_step"]
+    if last:
+        print("\nProgress:")
+        print(f"  Last step: {last['index']} {last['action']} -> {last['outcome']}")
+
 def rollback_to_checkpoint(checkpoint_id):
-    cp_path = LEDGER_DIR / f"checkpoints/{checkpoint_id}.json"
+    from ledger_schemas import Checkpoint
+
+    cp_path = CHECKPOINT_DIR / f"{checkpoint_id}.json"
     if not cp_path.exists():
-        print(f"❌ Checkpoint not found: {checkpoint_id}")
+        # scripts/retention.py archives old checkpoints out of the hot dir
+        rel = STATE_DIR.relative_to(LEDGER_DIR).as_posix()
+        archived = (LEDGER_DIR.parent / "archive" / "checkpoints" / ("_default" if rel == "." else rel)
+                    / f"{checkpoint_id}.json.gz")
+        if archived.exists():
+            print(f"❌ Checkpoint archived: {checkpoint_id}")
+            print(f"   Restore it first: python ~/.agent/scripts/retention.py restore-checkpoint {checkpoint_id}")
+        else:
+            print(f"❌ Checkpoint not found: {checkpoint_id}")
         return
     
     cp_data = load_json(cp_path)
     checkpoint = Checkpoint(**cp_data)
+
+    # Record the discarded branch so as-of never baselines on its checkpoints
+    live = load_json(TASK_LEDGER_PATH) or {}
+    rollbacks = list(live.get("metadata", {}).get(ROLLBACKS_KEY, []))
+    rollbacks.append({"to": checkpoint_id, "from": str(checkpoint.timestamp),
+                      "at": str(datetime.utcnow())})
+    checkpoint.task_ledger.metadata[ROLLBACKS_KEY] = rollbacks
     
     save_json(TASK_LEDGER_PATH, checkpoint.task_ledger.model_dump())
     save_json(PROGRESS_LEDGER_PATH, checkpoint.progress_ledger.model_dump())
     print(f"✅ Rolled back to checkpoint: {checkpoint_id}")
 
+def show_missions(active_only=False):
+    """List missions from the cross-mission index (no shard is opened)."""
+    missions = mission_registry.list_missions(LEDGER_DIR, active_only)
+    if not missions:
+        print("No registered missions.")
+        return
+    for mission_id, summary in missions:
+        counts = ", ".join(f"{k}={v}" for k, v in sorted(summary["status_counts"].items())) or "no tasks"
+        marker = "🟢" if summary["active"] else "⚪"
+        print(f"{marker} {mission_id}: {summary['description']}")
+        print(f"   Tasks: {counts} | Steps: {summary['step_count']} | Last activity: {summary['last_activity']}")
+
 def main():
     parser = argparse.ArgumentParser(description="Manage SOTA Harness Ledgers")
+    parser.add_argument("--mission", default=os.environ.get("AGENT_MISSION_ID"),
+                        help="Operate on this mission's ledger shard (default: $AGENT_MISSION_ID, "
+                             "else the single legacy ledger)")
     subparsers = parser.add_subparsers(dest="command")
 
     # Init
@@ -179,6 +447,12 @@ def main():
     step_p.add_argument("outcome")
     step_p.add_argument("--status", default="success")
 
+    # Add Steps (batch)
+    steps_p = subparsers.add_parser("add-steps", aliases=["import"],
+                                    help="Record steps from JSONL (one step object per line)")
+    steps_p.add_argument("file", nargs="?", default="-",
+                         help="JSONL file of steps (default: stdin)")
+
     # Complete Task
     comp_p = subparsers.add_parser("complete-task")
     comp_p.add_argument("task_id")
@@ -190,27 +464,94 @@ def main():
     cp_p = subparsers.add_parser("checkpoint")
     cp_p.add_argument("--reason", default="manual")
 
+    # Auto-checkpoint policy
+    policy_p = subparsers.add_parser("policy", help="Show or update the auto-checkpoint policy")
+    policy_p.add_argument("--every-steps", type=int, help="Checkpoint every N steps (0 = off)")
+    policy_p.add_argument("--every-minutes", type=int, help="Checkpoint every T minutes of activity (0 = off)")
+    policy_p.add_argument("--on-completion", action=argparse.BooleanOptionalAction,
+                          help="Checkpoint when a task completes")
+    policy_p.add_argument("--before-failure", action=argparse.BooleanOptionalAction,
+                          help="Checkpoint before recording a failure step")
+    policy_p.add_argument("--keep-last", type=int, help="Always keep the newest K auto checkpoints")
+    policy_p.add_argument("--hourly-hours", type=int, help="Keep one auto checkpoint per hour for H hours")
+    policy_p.add_argument("--daily-days", type=int, help="Keep one auto checkpoint per day for D days")
+
     # Resume
     subparsers.add_parser("resume")
 
+    # As-of (read-only time travel)
+    asof_p = subparsers.add_parser("as-of", help="Show ledger state at a timestamp or step index")
+    asof_p.add_argument("target", help="ISO timestamp (UTC) or step index")
+    asof_p.add_argument("--json", action="store_true", help="Print state as JSON")
+
     # Rollback
     rb_p = subparsers.add_parser("rollback")
     rb_p.add_argument("checkpoint_id")
 
+    # Missions (cross-mission index)
+    missions_p = subparsers.add_parser("missions", help="List missions from the registry index")
+    missions_p.add_argument("--active", action="store_true", help="Only missions with open work")
+
     args = parser.parse_args()
 
+    if args.mission:
+        try:
+            select_mission(args.mission)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if args.command != "init" and not STATE_DIR.exists():
+            print(f"❌ Unknown mission: {args.mission} (run init with --mission first)")
+            sys.exit(1)
+
+    if args.command == "missions":
+        show_missions(args.active)
+        return
+
+    if args.command == "init":
+        if args.mission and args.mission != args.mission_id:
+            print(f"❌ --mission {args.mission} does not match init mission {args.mission_id}")
+            sys.exit(1)
+        existing = load_json(TASK_LEDGER_PATH)
+        if not args.mission and existing and existing["mission_id"] != args.mission_id:
+            print(f"❌ Ledger already holds mission {existing['mission_id']}.")
+            print(f"   Use --mission {args.mission_id} to keep missions in separate shards.")
+            sys.exit(1)
+
+    with harness_trace.span(f"ledger.{args.command}", mission=args.mission) as span:
+        if is_mutating(args):
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            with mission_registry.file_lock(STATE_DIR / ".lock") as lock_wait:
+                if span:
+                    span.set(lock_wait_ms=round(lock_wait * 1000, 3))
+                run_command(args)
+                if args.mission:
+                    with harness_trace.span("ledger.refresh_index"):
+                        refresh_index(args.mission)
+        else:
+            run_command(args)
+
+def run_command(args):
     if args.command == "init":
         init_ledgers(args.mission_id, args.description, args.goals)
     elif args.command == "add-task":
         add_task(args.id, args.description, args.priority, args.deps)
     elif args.command == "add-step":
         add_step(args.task_id, args.action, args.outcome, args.status)
+    elif args.command in ("add-steps", "import"):
+        if not add_steps(args.file):
+            sys.exit(1)
     elif args.command == "complete-task":
         complete_task(args.task_id)
     elif args.command == "checkpoint":
-        create_checkpoint(args.reason)
+        if not create_checkpoint(args.reason):
+            sys.exit(1)
+    elif args.command == "policy":
+        configure_policy(args)
     elif args.command == "resume":
         resume_mission()
+    elif args.command == "as-of":
+        show_as_of(args.target, args.json)
     elif args.command == "rollback":
         rollback_to_checkpoint(args.checkpoint_id)
     elif args.command == "status":
@@ -0,0 +1,162 @@
+"""
+Read-only time-travel over the ledgers.
+
+Reconstructs task statuses and progress at any past point from the step
+history and the nearest earlier checkpoint, without touching the live
+ledgers. Works on the raw JSON so queries never load pydantic.
+
+Checkpoints are indexed by the timestamp encoded in their file name
+(cp_YYYYmmdd_HHMMSS[...].json), so only the chosen checkpoint is opened.
+A checkpoint is only used as the baseline when it belongs to the same
+mission, its steps are a prefix of the live steps, and it was not taken on
+a branch that a later rollback discarded (see ROLLBACKS_KEY).
+Steps are scanned in order and the scan stops at the first step past the
+target, so earlier targets parse fewer timestamps.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHECKPOINT_NAME = re.compile(r"^cp_(\d{8}_\d{6})")
+
+# Task ledger metadata key listing rollbacks: {"to", "from", "at"}. Checkpoints
+# taken after "from" (the restored checkpoint's time) and up to "at" belong to
+# the discarded branch.
+ROLLBACKS_KEY = "rollbacks"
+
+
+def completes_task(status, outcome):
+    """A successful step whose outcome mentions completion closes its task."""
+    return status == "success" and "completed" in outcome.lower()
+
+
+def parse_timestamp(value):
+    """Parse a ledger or user-supplied timestamp into a naive UTC datetime."""
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def checkpoint_index(checkpoint_dir):
+    """Sorted (timestamp, checkpoint_id) pairs, read from file names only."""
+    checkpoint_dir = Path(checkpoint_dir)
+    if not checkpoint_dir.exists():
+        return []
+    index = []
+    for path in checkpoint_dir.glob("cp_*.json"):
+        match = CHECKPOINT_NAME.match(path.name)
+        if match:
+            index.append((datetime.strptime(match.group(1), "%Y%m%d_%H%M%S"), path.stem))
+    index.sort()
+    return index
+
+
+def steps_until(steps, target):
+    """Number of leading steps recorded at or before target.
+
+    Steps are replayed in index order, so the count ends at the first step
+    after target even if a later imported step carries an earlier timestamp.
+    """
+    for count, step in enumerate(steps):
+        if parse_timestamp(step["timestamp"]) > target:
+            return count
+    return len(steps)
+
+
+def _is_baseline_for(checkpoint, mission_id, steps, step_count, rollbacks):
+    """Whether a checkpoint lies on the live history at or before step_count."""
+    if checkpoint["task_ledger"].get("mission_id") != mission_id:
+        return False
+    cp_steps = checkpoint["progress_ledger"]["steps"]
+    if len(cp_steps) > step_count:
+        return False
+    if cp_steps:
+        last, live = cp_steps[-1], steps[len(cp_steps) - 1]
+        if last["index"] != live["index"] or \
+                parse_timestamp(last["timestamp"]) != parse_timestamp(live["timestamp"]):
+            return False
+    taken = parse_timestamp(checkpoint["timestamp"])
+    return not any(parse_timestamp(r["from"]) < taken <= parse_timestamp(r["at"])
+                   for r in rollbacks)
+
+
+def _load_checkpoint_before(checkpoint_dir, index, target, accept=lambda checkpoint: True):
+    """Newest checkpoint created at or before target that `accept`s, or None.
+
+    File names only carry whole seconds, so the precise timestamp inside the
+    chosen checkpoint is checked and we step back if it is after target.
+    """
+    pos = bisect_right([ts for ts, _ in index], target)
+    while pos > 0:
+        pos -= 1
+        _, checkpoint_id = index[pos]
+        try:
+            with open(Path(checkpoint_dir) / f"{checkpoint_id}.json") as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            # Pruned or archived since the directory was listed
+            continue
+        if parse_timestamp(checkpoint["timestamp"]) <= target and accept(checkpoint):
+            return checkpoint
+    return None
+
+
+def state_as_of(task_data, progress_data, checkpoint_dir, target):
+    """Reconstruct ledger state at a timestamp (datetime) or step index (int)."""
+    steps = progress_data["steps"] if progress_data else []
+
+    if isinstance(target, int):
+        if not 0 <= target < len(steps):
+            raise ValueError(f"step index {target} out of range (0-{len(steps) - 1})")
+        step_count = target + 1
+        as_of = max(parse_timestamp(s["timestamp"]) for s in steps[:step_count])
+    else:
+        as_of = parse_timestamp(target)
+        step_count = steps_until(steps, as_of)
+
+    task_data = task_data or {}
+    mission_id = task_data.get("mission_id") or (progress_data or {}).get("mission_id")
+    rollbacks = task_data.get("metadata", {}).get(ROLLBACKS_KEY, [])
+    checkpoint = _load_checkpoint_before(
+        checkpoint_dir, checkpoint_index(checkpoint_dir), as_of,
+        lambda cp: _is_baseline_for(cp, mission_id, steps, step_count, rollbacks))
+
+    # Baseline statuses: the checkpoint's task ledger, else every task open
+    statuses = {}
+    descriptions = {}
+    replay_from = 0
+    if checkpoint:
+        for task in checkpoint["task_ledger"]["tasks"]:
+            statuses[task["id"]] = task["status"]
+            descriptions[task["id"]] = task["description"]
+        replay_from = len(checkpoint["progress_ledger"]["steps"])
+
+    # Tasks created since the baseline start out open
+    for task in task_data.get("tasks", []):
+        descriptions[task["id"]] = task["description"]
+        if task["id"] not in statuses and parse_timestamp(task["created_at"]) <= as_of:
+            statuses[task["id"]] = "open"
+
+    for step in steps[replay_from:step_count]:
+        if step["task_id"] in statuses and completes_task(step["status"], step["outcome"]):
+            statuses[step["task_id"]] = "completed"
+
+    tasks = [
+        {"id": task_id, "description": descriptions.get(task_id, ""), "status": status}
+        for task_id, status in statuses.items()
+    ]
+    return {
+        "as_of": as_of.isoformat(),
+        "checkpoint_id": checkpoint["checkpoint_id"] if checkpoint else None,
+        "step_count": step_count,
+        "last_step": steps[step_count - 1] if step_count else None,
+        "tasks": tasks,
+        "completed_tasks": sum(1 for t in tasks if t["status"] == "completed"),
+    }
@@ -0,0 +1,100 @@
+"""
+Mission registry: per-mission ledger shards with a cross-mission index.
+
+Layout (under the ledgers directory):
+
+    missions/
+        index.json              # {mission_id: summary} - the only file a
+                                # "what's active" query reads
+        .index.lock
+        <mission_id>/
+            task_ledger.json
+            progress_ledger.json
+            checkpoints/
+            .lock               # per-mission writer lock
+
+Writers on different missions take different locks and never contend; the
+index lock is held only for the read-modify-replace of index.json.
+"""
+
+import fcntl
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+MISSIONS_DIRNAME = "missions"
+INDEX_NAME = "index.json"
+MISSION_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+ACTIVE_STATUSES = ("open", "in_progress", "blocked")
+
+
+def missions_dir(ledger_dir):
+    return Path(ledger_dir) / MISSIONS_DIRNAME
+
+
+def mission_dir(ledger_dir, mission_id):
+    """Shard directory for a mission; rejects ids that are not path-safe."""
+    if not MISSION_ID.match(mission_id):
+        raise ValueError(f"invalid mission id: {mission_id!r}")
+    return missions_dir(ledger_dir) / mission_id
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Exclusive flock on lock_path; yields the seconds spent waiting."""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as f:
+        start = time.perf_counter()
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield time.perf_counter() - start
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def summarize(task_data, progress_data):
+    """Compact per-mission summary stored in the index."""
+    counts = {}
+    for task in (task_data or {}).get("tasks", []):
+        counts[task["status"]] = counts.get(task["status"], 0) + 1
+    return {
+        "description": (task_data or {}).get("mission_description", ""),
+        "status_counts": counts,
+        "step_count": len((progress_data or {}).get("steps", [])),
+        "active": any(counts.get(s) for s in ACTIVE_STATUSES) or not counts,
+        "last_activity": datetime.utcnow().isoformat(),
+    }
+
+
+def read_index(ledger_dir):
+    path = missions_dir(ledger_dir) / INDEX_NAME
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_index(ledger_dir, mission_id, summary):
+    """Replace one mission's entry in the index under the index lock."""
+    root = missions_dir(ledger_dir)
+    with file_lock(root / ".index.lock"):
+        index = read_index(ledger_dir)
+        index[mission_id] = summary
+        tmp_path = root / f".{INDEX_NAME}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, root / INDEX_NAME)
+
+
+def list_missions(ledger_dir, active_only=False):
+    """(mission_id, summary) pairs from the index, most recent activity first."""
+    missions = sorted(read_index(ledger_dir).items(),
+                      key=lambda item: item[1].get("last_activity", ""), reverse=True)
+    if active_only:
+        missions = [(m, s) for m, s in missions if s.get("active")]
+    return missions
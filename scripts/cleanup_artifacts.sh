@@ -28,4 +28,9 @@ if [ ! -z "$FRICTION_LOGS" ]; then
     done
 fi
 
+# Optionally compact long-lived harness state (audit logs, checkpoints, insights)
+if [ "$1" == "--retention" ]; then
+    python3 "$HOME/.agent/scripts/retention.py" run
+fi
+
 echo "✅ Artifact cleanup complete."
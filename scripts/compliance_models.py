@@ -0,0 +1,42 @@
+"""
+Compliance check result models.
+Kept apart from compliance_validators so importing the validators does not
+load pydantic until a check actually builds a result.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class ToolCheck(BaseModel):
+    tool_name: str
+    available: bool
+    path: Optional[str] = None
+
+class GitCheck(BaseModel):
+    is_clean: bool
+    branch: str
+    is_feature_branch: bool
+    uncommitted_files: List[str] = Field(default_factory=list)
+
+class BeadsCheck(BaseModel):
+    bd_available: bool
+    active_issues_count: int
+    msg: str
+
+class ContextCheck(BaseModel):
+    roadmap_exists: bool
+    implementation_plan_exists: bool
+    missing_docs: List[str] = Field(default_factory=list)
+
+class ApprovalCheck(BaseModel):
+    approved: bool
+    timestamp: Optional[str] = None
+    age_hours: float = 0.0
+    stale: bool = False
+
+class FlightCheckResult(BaseModel):
+    phase: str
+    passed: bool
+    blockers: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)
+    metadata: dict = Field(default_factory=dict)
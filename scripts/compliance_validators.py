@@ -1,54 +1,62 @@
-from typing import List, Optional, Tuple
-from pydantic import BaseModel, Field, validator
+from __future__ import annotations
+
 from pathlib import Path
+from datetime import datetime, timedelta
 import os
+import shutil
+
+from harness_cache import brain_session_dirs, git_dir, read_text
+import harness_trace
+
+# Tools the Initialization phase requires (docs/phases/02_initialization.md)
+REQUIRED_TOOLS = ("git", "bd", "uv")
+
+# Result models are resolved lazily from compliance_models (see __getattr__)
+_MODEL_NAMES = {
+    "ToolCheck", "GitCheck", "BeadsCheck", "ContextCheck",
+    "ApprovalCheck", "FlightCheckResult",
+}
 
-class ToolCheck(BaseModel):
-    tool_name: str
-    available: bool
-    path: Optional[str] = None
-
-class GitCheck(BaseModel):
-    is_clean: bool
-    branch: str
-    is_feature_branch: bool
-    uncommitted_files: List[str] = Field(default_factory=list)
-
-class BeadsCheck(BaseModel):
-    bd_available: bool
-    active_issues_count: int
-    msg: str
-
-class ContextCheck(BaseModel):
-    roadmap_exists: bool
-    implementation_plan_exists: bool
-    missing_docs: List[str] = Field(default_factory=list)
-
-class ApprovalCheck(BaseModel):
-    approved: bool
-    timestamp: Optional[str] = None
-    age_hours: float = 0.0
-    stale: bool = False
-
-class FlightCheckResult(BaseModel):
-    phase: str
-    passed: bool
-    blockers: List[str] = Field(default_factory=list)
-    warnings: List[str] = Field(default_factory=list)
-    metadata: dict = Field(default_factory=dict)
+
+def __getattr__(name):
+    if name in _MODEL_NAMES:
+        import compliance_models
+        return getattr(compliance_models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Validator logic
-import subprocess
-from datetime import datetime, timedelta
+@harness_trace.traced("compliance.check_tools")
+def check_tools() -> list[ToolCheck]:
+    from compliance_models import ToolCheck
 
+    checks = []
+    for tool in REQUIRED_TOOLS:
+        path = shutil.which(tool)
+        checks.append(ToolCheck(tool_name=tool, available=path is not None, path=path))
+    return checks
+
+@harness_trace.traced("compliance.check_workspace_integrity")
+def check_workspace_integrity(project_root: Path) -> list[str]:
+    """Workspace markers (.git, .agent, .beads) that are missing."""
+    missing = []
+    if git_dir(str(project_root)) is None:
+        missing.append(".git")
+    for marker in (".agent", ".beads"):
+        if not (project_root / marker).is_dir():
+            missing.append(marker)
+    return missing
+
+@harness_trace.traced("compliance.check_git")
 def check_git(project_root: Path) -> GitCheck:
+    from compliance_models import GitCheck
+
     try:
         # Get branch
-        branch = subprocess.check_output(["git", "branch", "--show-current"], text=True).strip()
+        branch = harness_trace.check_output(["git", "branch", "--show-current"], text=True).strip()
         is_feature = branch.startswith(("agent/", "feature/", "chore/"))
         
         # Get status
-        status_out = subprocess.check_output(["git", "status", "--porcelain"], text=True).strip()
+        status_out = harness_trace.check_output(["git", "status", "--porcelain"], text=True).strip()
         uncommitted = [line[3:] for line in status_out.split("\n") if line.strip()]
         
         return GitCheck(
@@ -60,7 +68,10 @@ def check_git(project_root: Path) -> GitCheck:
     except Exception as e:
         return GitCheck(is_clean=False, branch="unknown", is_feature_branch=False, uncommitted_files=[str(e)])
 
+@harness_trace.traced("compliance.check_planning_docs")
 def check_planning_docs(project_root: Path) -> ContextCheck:
+    from compliance_models import ContextCheck
+
     roadmap = project_root / ".agent/rules/ROADMAP.md"
     impl_plan = project_root / ".agent/rules/ImplementationPlan.md"
     
@@ -76,19 +87,19 @@ def check_planning_docs(project_root: Path) -> ContextCheck:
         missing_docs=missing
     )
 
+@harness_trace.traced("compliance.check_approval")
 def check_approval(max_hours: int = 4) -> ApprovalCheck:
+    from compliance_models import ApprovalCheck
+
     task_paths = [Path(".agent/task.md"), Path("task.md")]
     
     # Check brain directory (most recent)
-    brain_dir = Path.home() / ".gemini" / "antigravity" / "brain"
-    if brain_dir.exists():
-        session_dirs = sorted([d for d in brain_dir.iterdir() if d.is_dir()], key=lambda x: x.stat().st_mtime, reverse=True)[:3]
-        for d in session_dirs:
-            task_paths.append(d / "task.md")
+    for d in brain_session_dirs()[:3]:
+        task_paths.append(d / "task.md")
 
     for path in task_paths:
         if path.exists():
-            content = path.read_text()
+            content = read_text(path)
             if "## Approval" in content or "[x]" in content.lower():
                 mtime = datetime.fromtimestamp(path.stat().st_mtime)
                 age = (datetime.now() - mtime).total_seconds() / 3600
@@ -100,9 +111,12 @@ def check_approval(max_hours: int = 4) -> ApprovalCheck:
                 )
     return ApprovalCheck(approved=False)
 
+@harness_trace.traced("compliance.check_beads")
 def check_beads() -> BeadsCheck:
+    from compliance_models import BeadsCheck
+
     try:
-        result = subprocess.run(["bd", "ready"], capture_output=True, text=True, timeout=10)
+        result = harness_trace.run(["bd", "ready"], capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
             count = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
             return BeadsCheck(bd_available=True, active_issues_count=count, msg=f"Issues ready: {count}")
@@ -110,26 +124,40 @@ def check_beads() -> BeadsCheck:
     except Exception as e:
         return BeadsCheck(bd_available=False, active_issues_count=0, msg=str(e))
 
+@harness_trace.traced("compliance.validate_initialization")
 def validate_initialization(project_root: Path) -> FlightCheckResult:
+    from compliance_models import FlightCheckResult
+
     blockers = []
     warnings = []
     
-    # 1. Context
+    # 1. Tools
+    tools = check_tools()
+    for tool in tools:
+        if not tool.available:
+            blockers.append(f"Required tool not found: {tool.tool_name}")
+
+    # 2. Workspace integrity
+    missing_markers = check_workspace_integrity(project_root)
+    if missing_markers:
+        blockers.append(f"Workspace integrity: missing {', '.join(missing_markers)}")
+
+    # 3. Context
     context = check_planning_docs(project_root)
     if not context.roadmap_exists or not context.implementation_plan_exists:
-        warnings.append(f"Missing planning docs: {context.missing_docs}")
+        blockers.append(f"Missing planning docs: {context.missing_docs}")
         
-    # 2. Issues
+    # 4. Issues (optional for planning)
     beads = check_beads()
     if not beads.bd_available:
         warnings.append(f"Beads issues: {beads.msg}")
         
-    # 3. Approval
+    # 5. Approval (valid for 4 hours)
     approval = check_approval()
     if not approval.approved:
-        warnings.append("No plan approval found in task.md")
+        blockers.append("No plan approval found in task.md")
     elif approval.stale:
-        warnings.append(f"Plan approval is stale ({approval.age_hours:.1f} hours old)")
+        blockers.append(f"Plan approval is stale ({approval.age_hours:.1f} hours old)")
         
     passed = len(blockers) == 0
     return FlightCheckResult(
@@ -138,6 +166,8 @@ def validate_initialization(project_root: Path) -> FlightCheckResult:
         blockers=blockers,
         warnings=warnings,
         metadata={
+            "tools": [tool.model_dump() for tool in tools],
+            "missing_workspace_markers": missing_markers,
             "context": context.model_dump(),
             "beads": beads.model_dump(),
             "approval": approval.model_dump()
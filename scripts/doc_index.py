@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Doc Section Index
+
+Splits the markdown under docs/, rules/ and templates/code_styleguides/ into
+heading-addressed sections and keeps them in index/doc_sections.json so an
+agent can load one section instead of a whole file.
+
+- Section ids are stable: `<file>#<parent-slug>/<heading-slug>` (with a -2,
+  -3 suffix for repeated headings), so editing one section never renames
+  another.
+- Each section records its byte offset/length (O(1) reads), an approximate
+  token count and a content hash.
+- A keyword inverted index maps terms to the sections that contain them.
+- Rebuilds are incremental: unchanged files (size/mtime, then content hash)
+  are skipped, and only the changed files' sections and postings are
+  replaced.
+
+Usage:
+    python ~/.agent/scripts/doc_index.py build [--full]
+    python ~/.agent/scripts/doc_index.py get SECTION_ID
+    python ~/.agent/scripts/doc_index.py search TERM [TERM ...] [--limit 10]
+    python ~/.agent/scripts/doc_index.py list [FILE]
+    python ~/.agent/scripts/doc_index.py check
+
+Exit codes:
+    0: Success (check: index is fresh)
+    1: Section not found, or check found a stale/missing index
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+INDEX_RELPATH = Path("index") / "doc_sections.json"
+ROOTS = ("docs", "rules", "templates/code_styleguides")
+INDEX_VERSION = 1
+
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+WORD = re.compile(r"[a-z0-9][a-z0-9_-]{2,}")
+# Rough BPE-style estimate: words, numbers and individual punctuation marks
+TOKEN = re.compile(r"\w+|[^\w\s]")
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has have this that
+with from they will would there their what when which who how its into than then them
+these those been being also only other over such very just should must may use used
+""".split())
+
+
+def slugify(text: str) -> str:
+    slug = re.sub(r"[^\w\s-]", "", text.lower()).strip()
+    return re.sub(r"[\s_]+", "-", slug) or "section"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def terms_of(text: str) -> dict:
+    counts = {}
+    for term in WORD.findall(text.lower()):
+        if term not in STOPWORDS:
+            counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def split_sections(rel_path: str, data: bytes) -> list:
+    """Sections of one markdown file as (id, record, term counts) tuples."""
+    lines = data.decode(errors="replace").splitlines(keepends=True)
+    starts = []  # (byte offset, level, heading)
+    offset = 0
+    in_fence = False
+    for line in lines:
+        if FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING.match(line.rstrip("\n"))
+            if match:
+                starts.append((offset, len(match.group(1)), match.group(2)))
+        offset += len(line.encode())
+
+    # Text before the first heading becomes a preamble section
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, 0, ""))
+
+    sections = []
+    seen = {}
+    stack = []  # (level, slug)
+    for i, (start, level, heading) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(data)
+        chunk = data[start:end]
+        text = chunk.decode(errors="replace")
+        if level == 0:
+            if not text.strip():
+                continue
+            slug_path = "_preamble"
+            path = []
+        else:
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, slugify(heading)))
+            slug_path = "/".join(slug for _, slug in stack)
+            path = [s for _, s in stack[:-1]]
+
+        section_id = f"{rel_path}#{slug_path}"
+        seen[section_id] = seen.get(section_id, 0) + 1
+        if seen[section_id] > 1:
+            section_id = f"{section_id}-{seen[section_id]}"
+
+        sections.append((section_id, {
+            "file": rel_path,
+            "heading": heading,
+            "level": level,
+            "path": path,
+            "offset": start,
+            "length": end - start,
+            "tokens": len(TOKEN.findall(text)),
+            "hash": content_hash(chunk),
+        }, terms_of(text)))
+    return sections
+
+
+class DocIndex:
+    """Heading-addressed section index with a keyword inverted index."""
+
+    def __init__(self, agent_dir: Path = AGENT_DIR, index_path: Path | None = None):
+        self.agent_dir = Path(agent_dir)
+        self.index_path = Path(index_path) if index_path else self.agent_dir / INDEX_RELPATH
+        self.data = self._load()
+
+    def _empty(self):
+        return {"version": INDEX_VERSION, "roots": list(ROOTS),
+                "files": {}, "sections": {}, "inverted": {}}
+
+    def _load(self):
+        if self.index_path.exists():
+            try:
+                with open(self.index_path) as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    return data
+            except json.JSONDecodeError:
+                pass
+        return self._empty()
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def source_files(self) -> dict:
+        """Relative path -> absolute path for every indexed markdown file."""
+        files = {}
+        for root in ROOTS:
+            base = self.agent_dir / root
+            if base.is_dir():
+                for path in sorted(base.rglob("*.md")):
+                    if path.is_file():
+                        files[path.relative_to(self.agent_dir).as_posix()] = path
+        return files
+
+    def changes(self):
+        """(changed, removed) relative paths; stat first, hash only on stat mismatch."""
+        files = self.source_files()
+        changed = []
+        for rel, path in files.items():
+            record = self.data["files"].get(rel)
+            stat = path.stat()
+            if record and (record["size"], record["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            if record and record["size"] == stat.st_size and \
+                    content_hash(path.read_bytes()) == record["hash"]:
+                record["mtime_ns"] = stat.st_mtime_ns  # touched, not edited
+                continue
+            changed.append(rel)
+        removed = [rel for rel in self.data["files"] if rel not in files]
+        return changed, removed
+
+    def _drop_file(self, rel: str):
+        for section_id in self.data["files"].pop(rel, {}).get("sections", []):
+            section = self.data["sections"].pop(section_id, None)
+            for term in (section or {}).get("terms", []):
+                postings = self.data["inverted"].get(term)
+                if postings is not None:
+                    postings.pop(section_id, None)
+                    if not postings:
+                        del self.data["inverted"][term]
+
+    def _add_file(self, rel: str, path: Path):
+        data = path.read_bytes()
+        stat = path.stat()
+        ids = []
+        for section_id, record, terms in split_sections(rel, data):
+            record["terms"] = sorted(terms)
+            self.data["sections"][section_id] = record
+            for term, count in terms.items():
+                self.data["inverted"].setdefault(term, {})[section_id] = count
+            ids.append(section_id)
+        self.data["files"][rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                   "hash": content_hash(data), "sections": ids}
+
+    def build(self, full: bool = False) -> dict:
+        """Re-index changed files only (everything with full=True)."""
+        if full:
+            self.data = self._empty()
+        files = self.source_files()
+        changed, removed = self.changes()
+        for rel in removed:
+            self._drop_file(rel)
+        for rel in changed:
+            self._drop_file(rel)
+            self._add_file(rel, files[rel])
+        self.save()
+        return {"files": len(files), "reindexed": len(changed), "removed": len(removed),
+                "sections": len(self.data["sections"])}
+
+    def stale_files(self) -> list:
+        """Files whose index entry is missing, outdated or orphaned."""
+        changed, removed = self.changes()
+        return sorted(changed + removed)
+
+    def get(self, section_id: str) -> str | None:
+        """Section text read directly from its byte range."""
+        section = self.data["sections"].get(section_id)
+        if section is None:
+            return None
+        with open(self.agent_dir / section["file"], "rb") as f:
+            f.seek(section["offset"])
+            return f.read(section["length"]).decode(errors="replace")
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Sections ranked by summed tf-idf of the query terms."""
+        import math
+
+        total = max(1, len(self.data["sections"]))
+        scores = {}
+        for term in terms_of(query):
+            postings = self.data["inverted"].get(term, {})
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for section_id, count in postings.items():
+                scores[section_id] = scores.get(section_id, 0.0) + count * idf
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(section_id, round(score, 2), self.data["sections"][section_id])
+                for section_id, score in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heading-addressed doc section index")
+    parser.add_argument("--index", default=None, help="Index file (default: index/doc_sections.json)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    build_p = subparsers.add_parser("build", help="Index changed files")
+    build_p.add_argument("--full", action="store_true", help="Rebuild from scratch")
+
+    get_p = subparsers.add_parser("get", help="Print one section")
+    get_p.add_argument("section_id")
+
+    search_p = subparsers.add_parser("search", help="Keyword search over sections")
+    search_p.add_argument("terms", nargs="+")
+    search_p.add_argument("--limit", type=int, default=10)
+
+    list_p = subparsers.add_parser("list", help="List section ids")
+    list_p.add_argument("file", nargs="?", help="Only sections of this file (e.g. docs/GLOBAL_INDEX.md)")
+
+    subparsers.add_parser("check", help="Exit 1 if the index is missing or stale")
+
+    args = parser.parse_args()
+    index = DocIndex(index_path=args.index)
+
+    if args.command == "build":
+        summary = index.build(full=args.full)
+        print(f"✅ Indexed {summary['sections']} sections from {summary['files']} files "
+              f"({summary['reindexed']} re-indexed, {summary['removed']} removed)")
+        return 0
+
+    if args.command == "get":
+        text = index.get(args.section_id)
+        if text is None:
+            print(f"❌ Unknown section: {args.section_id}")
+            return 1
+        print(text, end="")
+        return 0
+
+    if args.command == "search":
+        results = index.search(" ".join(args.terms), args.limit)
+        if not results:
+            print("No matching sections.")
+        for section_id, score, section in results:
+            print(f"  {score:>7.2f}  {section_id}  ({section['tokens']} tokens)")
+        return 0
+
+    if args.command == "list":
+        for section_id, section in index.data["sections"].items():
+            if not args.file or section["file"] == args.file:
+                print(f"  {section_id}  ({section['tokens']} tokens)")
+        return 0
+
+    if args.command == "check":
+        if not index.index_path.exists():
+            print(f"❌ No doc index at {index.index_path}. Run: doc_index.py build")
+            return 1
+        stale = index.stale_files()
+        if stale:
+            print(f"❌ Doc index is stale for {len(stale)} file(s):")
+            for rel in stale[:10]:
+                print(f"  - {rel}")
+            return 1
+        print("✅ Doc index is fresh")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Harness Cache
+Process-wide caches shared by the in-process gate checks.
+
+The compliance validators and the todo enforcer both look for task.md in the
+most recent brain session directories. When they run in the same process
+(see session_gate.py) the directory scan and file reads happen once.
+"""
+
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+import harness_trace
+
+BRAIN_DIR = Path.home() / ".gemini" / "antigravity" / "brain"
+
+
+@lru_cache(maxsize=None)
+def brain_session_dirs() -> list[Path]:
+    """Brain session directories, most recently modified first."""
+    if not BRAIN_DIR.exists():
+        return []
+    dirs = []
+    for d in BRAIN_DIR.iterdir():
+        if d.is_dir():
+            dirs.append((d.stat().st_mtime, d))
+    dirs.sort(key=lambda item: item[0], reverse=True)
+    return [d for _, d in dirs]
+
+
+@lru_cache(maxsize=None)
+def read_text(path: Path) -> str:
+    """Read a small text file once per process."""
+    return path.read_text()
+
+
+@lru_cache(maxsize=None)
+def git_dir(cwd: str | None = None) -> str | None:
+    """Return the git dir for cwd, or None when not inside a repository."""
+    try:
+        result = harness_trace.run(
+            ["git", "rev-parse", "--git-dir"],
+            capture_output=True, text=True, cwd=cwd, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def clear():
+    """Drop all cached values (e.g. between benchmark iterations)."""
+    brain_session_dirs.cache_clear()
+    read_text.cache_clear()
+    git_dir.cache_clear()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Harness Tracing
+
+Lightweight spans for the harness tools (session gate, compliance
+validators, SOP validator, todo enforcer, audit logger, ledger manager).
+
+Tracing is off unless AGENT_TRACE is set. When off, span() returns a shared
+no-op context manager and traced() returns the function unchanged, so
+instrumented code pays one attribute lookup per span.
+
+    AGENT_TRACE=1               enable, write to ~/.agent/logs/trace.jsonl
+    AGENT_TRACE_FILE=PATH       write somewhere else
+
+Each finished span is appended as one JSON line. A process that starts a
+trace exports AGENT_TRACE_ID / AGENT_TRACE_PARENT, so child processes
+(the gate shim, ledger-manager, wrapped git/bd/markdownlint calls) join the
+same trace. Export one AGENT_TRACE_ID in the shell to stitch a whole turn
+(gate plus ledger commands) into a single flame chart.
+
+Usage:
+    python ~/.agent/scripts/harness_trace.py export [--trace-id ID | --all] [-o trace.json]
+    python ~/.agent/scripts/harness_trace.py summary [--trace-id ID | --all]
+
+Open the exported file in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import os
+import sys
+import time
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+
+ENABLED = bool(os.environ.get("AGENT_TRACE"))
+TRACE_FILE = Path(os.environ.get("AGENT_TRACE_FILE")
+                  or Path.home() / ".agent" / "logs" / "trace.jsonl")
+
+_NOOP = nullcontext()
+_stacks = {}
+
+
+def _new_id() -> str:
+    return os.urandom(8).hex()
+
+
+def _stack() -> list:
+    import threading
+
+    return _stacks.setdefault(threading.get_ident(), [])
+
+
+class Span:
+    """One timed operation; use through span()."""
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        import threading
+
+        stack = _stack()
+        if "AGENT_TRACE_ID" not in os.environ:
+            os.environ["AGENT_TRACE_ID"] = _new_id()
+        self.trace_id = os.environ["AGENT_TRACE_ID"]
+        self.parent_id = stack[-1].span_id if stack else os.environ.get("AGENT_TRACE_PARENT")
+        self.span_id = _new_id()
+        self.tid = threading.get_ident()
+        stack.append(self)
+        self.start_us = time.time_ns() // 1000
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_us = (time.perf_counter_ns() - self._t0) // 1000
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "pid": os.getpid(),
+            "tid": self.tid,
+            "start_us": self.start_us,
+            "dur_us": duration_us,
+            "status": "error" if exc_type else "ok",
+        }
+        if exc_type is SystemExit:
+            # sys.exit() inside a CLI span is a normal return path
+            record["status"] = "ok" if exc.code in (0, None) else "error"
+            record["exit_code"] = exc.code
+        elif exc_type:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        if self.attrs:
+            record["attrs"] = self.attrs
+        _write(record)
+        return False
+
+
+def _write(record: dict):
+    import json
+
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # One O_APPEND write per span keeps lines intact across processes
+        fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # tracing must never break the traced tool
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block: `with span("gate.check_todos"): ...`"""
+    if not ENABLED:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: str | None = None):
+    """Decorator form of span(); a no-op wrapper when tracing is off."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _child_env(kwargs: dict):
+    """Propagate the current span to a child process."""
+    stack = _stack()
+    if not stack:
+        return
+    env = dict(kwargs.get("env") or os.environ)
+    env["AGENT_TRACE_ID"] = stack[-1].trace_id
+    env["AGENT_TRACE_PARENT"] = stack[-1].span_id
+    kwargs["env"] = env
+
+
+def run(cmd, **kwargs):
+    """subprocess.run recorded as an `exec:<program>` child span."""
+    import subprocess
+
+    if not ENABLED:
+        return subprocess.run(cmd, **kwargs)
+    with Span(f"exec:{Path(cmd[0]).name}", {"argv": list(cmd)}) as s:
+        _child_env(kwargs)
+        result = subprocess.run(cmd, **kwargs)
+        s.set(returncode=result.returncode)
+        return result
+
+
+def check_output(cmd, **kwargs):
+    """subprocess.check_output recorded as an `exec:<program>` child span."""
+    import subprocess
+
+    if not ENABLED:
+        return subprocess.check_output(cmd, **kwargs)
+    with Span(f"exec:{Path(cmd[0]).name}", {"argv": list(cmd)}):
+        _child_env(kwargs)
+        return subprocess.check_output(cmd, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Reading and exporting traces
+# ---------------------------------------------------------------------------
+
+def read_spans(path: Path = None, trace_id: str | None = None, last: bool = True) -> list:
+    """Spans from a JSONL trace file; by default only the most recent trace."""
+    import json
+
+    path = Path(path or TRACE_FILE)
+    spans = []
+    if not path.exists():
+        return spans
+    with open(path) as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    if trace_id is None and last and spans:
+        trace_id = max(spans, key=lambda s: s["start_us"])["trace_id"]
+    if trace_id is not None:
+        spans = [s for s in spans if s["trace_id"] == trace_id]
+    return spans
+
+
+def to_chrome_trace(spans: list) -> dict:
+    """Chrome Trace Event format (complete events), one row per pid/thread."""
+    events = []
+    for s in sorted(spans, key=lambda s: s["start_us"]):
+        args = dict(s.get("attrs", {}))
+        args.update(span_id=s["span_id"], parent_id=s["parent_id"], status=s["status"])
+        if "error" in s:
+            args["error"] = s["error"]
+        events.append({
+            "name": s["name"],
+            "cat": s["name"].split(".", 1)[0].split(":", 1)[0],
+            "ph": "X",
+            "ts": s["start_us"],
+            "dur": s["dur_us"],
+            "pid": s["pid"],
+            "tid": s["tid"],
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summarize(spans: list) -> list:
+    """(name, count, total_ms, max_ms) sorted by total time."""
+    totals = {}
+    for s in spans:
+        count, total, peak = totals.get(s["name"], (0, 0, 0))
+        totals[s["name"]] = (count + 1, total + s["dur_us"], max(peak, s["dur_us"]))
+    return sorted(((name, c, t / 1000, m / 1000) for name, (c, t, m) in totals.items()),
+                  key=lambda row: row[2], reverse=True)
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Harness trace export and summary")
+    parser.add_argument("--input", default=str(TRACE_FILE), help="Trace JSONL file")
+    subparsers = parser.add_subparsers(dest="command")
+    for command in ("export", "summary"):
+        sub = subparsers.add_parser(command)
+        sub.add_argument("--trace-id", help="Trace to select (default: most recent)")
+        sub.add_argument("--all", action="store_true", help="Include every trace in the file")
+        if command == "export":
+            sub.add_argument("-o", "--output", default="trace.json", help="Chrome trace file")
+
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return 0
+
+    spans = read_spans(args.input, args.trace_id, last=not args.all)
+    if not spans:
+        print(f"⚠️  No spans found in {args.input}")
+        return 1
+
+    if args.command == "export":
+        with open(args.output, "w") as f:
+            json.dump(to_chrome_trace(spans), f)
+        print(f"✅ Exported {len(spans)} span(s) to {args.output}")
+        print("   Open in chrome://tracing or https://ui.perfetto.dev")
+    else:
+        print(f"⏱️  {len(spans)} span(s)")
+        print(f"  {'span':<44} {'count':>6} {'total ms':>10} {'max ms':>9}")
+        for name, count, total_ms, max_ms in summarize(spans):
+            print(f"  {name:<44} {count:>6} {total_ms:>10.2f} {max_ms:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Learnings Store
+
+SQLite index over memory/learnings: pending/applied learnings, proactive
+suggestions, skill versions and the per-insight ace_insights/ files. The
+JSON files remain the source of truth; this store makes them queryable
+without loading and scanning every file.
+
+- Indexed columns: skill, category, priority, status, store
+- Full-text search over content (FTS5, falling back to LIKE when the
+  SQLite build has no FTS5)
+- Near-identical entries are deduplicated per store by a hash of the
+  normalized content
+- The monolithic JSON arrays are re-synced only when their size/mtime
+  changes; ace_insight_*/ace_repair_* files are ingested append-only
+
+Usage:
+    python ~/.agent/scripts/learnings_store.py sync
+    python ~/.agent/scripts/learnings_store.py query --store pending --skill JavaScript
+    python ~/.agent/scripts/learnings_store.py search "null checking"
+    python ~/.agent/scripts/learnings_store.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+LEARNINGS_DIR = Path(__file__).resolve().parent.parent / "memory" / "learnings"
+DB_NAME = "learnings.db"
+
+# store name -> monolithic JSON array file
+ARRAY_FILES = {
+    "pending": "pending_learnings.json",
+    "applied": "applied_learnings.json",
+    "suggestion": "proactive_suggestions.json",
+    "skill_version": "skill_versions.json",
+}
+INSIGHTS_DIR = "ace_insights"
+
+FIELDS = ("id", "store", "kind", "skill", "category", "priority", "status",
+          "source", "content", "content_hash", "created_at", "raw")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learnings (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    store TEXT NOT NULL,
+    kind TEXT,
+    skill TEXT,
+    category TEXT,
+    priority TEXT,
+    status TEXT,
+    source TEXT,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    created_at TEXT,
+    raw TEXT NOT NULL,
+    UNIQUE (store, content_hash)
+);
+CREATE INDEX IF NOT EXISTS ix_learnings_skill ON learnings (skill COLLATE NOCASE, store, created_at);
+CREATE INDEX IF NOT EXISTS ix_learnings_store ON learnings (store, status, created_at);
+CREATE INDEX IF NOT EXISTS ix_learnings_category ON learnings (category, store, created_at);
+CREATE INDEX IF NOT EXISTS ix_learnings_priority ON learnings (priority, store, created_at);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS learnings_fts USING fts5(
+    content, skill, category, priority,
+    content='learnings', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS learnings_ai AFTER INSERT ON learnings BEGIN
+    INSERT INTO learnings_fts (rowid, content, skill, category, priority)
+    VALUES (new.rowid, new.content, new.skill, new.category, new.priority);
+END;
+CREATE TRIGGER IF NOT EXISTS learnings_ad AFTER DELETE ON learnings BEGIN
+    INSERT INTO learnings_fts (learnings_fts, rowid, content, skill, category, priority)
+    VALUES ('delete', old.rowid, old.content, old.skill, old.category, old.priority);
+END;
+CREATE TRIGGER IF NOT EXISTS learnings_au AFTER UPDATE ON learnings BEGIN
+    INSERT INTO learnings_fts (learnings_fts, rowid, content, skill, category, priority)
+    VALUES ('delete', old.rowid, old.content, old.skill, old.category, old.priority);
+    INSERT INTO learnings_fts (rowid, content, skill, category, priority)
+    VALUES (new.rowid, new.content, new.skill, new.category, new.priority);
+END;
+"""
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize(text).encode()).hexdigest()
+
+
+def flatten_text(value) -> str:
+    """Join all string leaves of a JSON value into searchable text."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(flatten_text(v) for v in value.values() if v is not None)
+    if isinstance(value, list):
+        return " ".join(flatten_text(v) for v in value)
+    return ""
+
+
+def _row(store, entry, content, **fields):
+    return {
+        "id": fields.get("id"),
+        "store": store,
+        "kind": fields.get("kind"),
+        "skill": fields.get("skill"),
+        "category": fields.get("category"),
+        "priority": fields.get("priority"),
+        "status": fields.get("status"),
+        "source": fields.get("source"),
+        "content": content,
+        "content_hash": content_hash(content),
+        "created_at": fields.get("created_at"),
+        "raw": json.dumps(entry, default=str),
+    }
+
+
+def rows_for_learning(store, entry):
+    """Pending/applied learnings: one row per entry."""
+    content = entry.get("content")
+    details = content if isinstance(content, dict) else {}
+    text = details.get("insight") or details.get("line") or flatten_text(content)
+    yield _row(
+        store, entry, text,
+        id=entry.get("id"),
+        kind=entry.get("type"),
+        skill=entry.get("skill") or entry.get("applied_to") or details.get("skill"),
+        category=details.get("category") or details.get("type"),
+        priority=entry.get("priority"),
+        status=entry.get("status"),
+        source=entry.get("source"),
+        created_at=entry.get("created_at"),
+    )
+
+
+def rows_for_suggestion(store, entry):
+    """Proactive suggestions: one row per suggestion."""
+    for suggestion in entry.get("suggestions", []):
+        text = f"{suggestion.get('title', '')}: {suggestion.get('description', '')}"
+        yield _row(
+            store, suggestion, text,
+            kind=suggestion.get("type"),
+            category=suggestion.get("type"),
+            priority=suggestion.get("priority"),
+            source=suggestion.get("pattern_evidence", {}).get("source"),
+            created_at=entry.get("timestamp"),
+        )
+
+
+def rows_for_skill_version(store, entry):
+    """Skill versions: one row per tag."""
+    yield _row(
+        store, entry, entry.get("description", ""),
+        id=entry.get("tag"),
+        kind=entry.get("type"),
+        skill=entry.get("skill"),
+        source=entry.get("author"),
+        created_at=entry.get("timestamp"),
+    )
+
+
+def rows_for_insight_file(entry):
+    """ace_insight_*/ace_repair_* files: one row per insight or repair."""
+    kind = entry.get("type")
+    created_at = entry.get("timestamp")
+    for insight in entry.get("insights", []):
+        yield _row("ace_insight", {"query": entry.get("query"), "insight": insight}, insight,
+                   kind=kind, category=kind, source="ace_reflector", created_at=created_at)
+    for repair in entry.get("repairs", []):
+        text = f"{repair.get('action', '')}: {repair.get('reason', '')}"
+        yield _row("ace_repair", {"query": entry.get("query"), **repair}, text,
+                   kind=kind, category=repair.get("action"), source="ace_graph_reflector",
+                   created_at=created_at)
+
+
+ROW_BUILDERS = {
+    "pending": rows_for_learning,
+    "applied": rows_for_learning,
+    "suggestion": rows_for_suggestion,
+    "skill_version": rows_for_skill_version,
+}
+
+
+class LearningsStore:
+    """Indexed, deduplicated view over memory/learnings."""
+
+    def __init__(self, learnings_dir: Path = LEARNINGS_DIR, db_path: Path | None = None):
+        self.learnings_dir = Path(learnings_dir)
+        self.db_path = Path(db_path) if db_path else self.learnings_dir / DB_NAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+
+    def close(self):
+        self.conn.close()
+
+    def _file_changed(self, path: Path) -> bool:
+        stat = path.stat()
+        row = self.conn.execute(
+            "SELECT size, mtime_ns FROM ingested_files WHERE path = ?", (str(path),)
+        ).fetchone()
+        return row is None or (row["size"], row["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns)
+
+    def _mark_ingested(self, path: Path):
+        stat = path.stat()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns) VALUES (?, ?, ?)",
+            (str(path), stat.st_size, stat.st_mtime_ns),
+        )
+
+    def insert_rows(self, rows) -> tuple[int, int]:
+        """Insert rows, skipping near-duplicates. Returns (added, duplicates)."""
+        sql = (f"INSERT OR IGNORE INTO learnings ({', '.join(FIELDS)}) "
+               f"VALUES ({', '.join('?' * len(FIELDS))})")
+        values = [[row[f] for f in FIELDS] for row in rows]
+        before = self.conn.execute("SELECT COUNT(*) FROM learnings").fetchone()[0]
+        self.conn.executemany(sql, values)
+        added = self.conn.execute("SELECT COUNT(*) FROM learnings").fetchone()[0] - before
+        return added, len(values) - added
+
+    def upsert_rows(self, rows, existing: dict) -> tuple[int, int, int]:
+        """Insert unseen rows and refresh the metadata of rows whose entry
+        changed (e.g. a status update). `existing` maps content_hash -> raw
+        for the store. Returns (added, updated, duplicates)."""
+        unique = {}
+        for row in rows:
+            unique.setdefault(row["content_hash"], row)  # first near-duplicate wins
+        changed = [row for h, row in unique.items() if existing.get(h) != row["raw"]]
+        updates = ", ".join(f"{f} = excluded.{f}" for f in FIELDS
+                            if f not in ("store", "content_hash"))
+        sql = (f"INSERT INTO learnings ({', '.join(FIELDS)}) "
+               f"VALUES ({', '.join('?' * len(FIELDS))}) "
+               f"ON CONFLICT (store, content_hash) DO UPDATE SET {updates}")
+        self.conn.executemany(sql, [[row[f] for f in FIELDS] for row in changed])
+        added = sum(1 for row in changed if row["content_hash"] not in existing)
+        return added, len(changed) - added, len(rows) - len(unique)
+
+    def sync(self) -> dict:
+        """Bring the index up to date with the JSON files on disk."""
+        summary = {"added": 0, "updated": 0, "removed": 0, "duplicates": 0, "files": 0}
+        with self.conn:
+            for store, filename in ARRAY_FILES.items():
+                path = self.learnings_dir / filename
+                if not path.exists() or not self._file_changed(path):
+                    continue
+                with open(path) as f:
+                    entries = json.load(f)
+                # Arrays are rewritten in place (pending -> applied, status
+                # changes), so rows whose content left the file are dropped,
+                # unseen content is inserted and changed entries are updated.
+                rows = [r for e in entries for r in ROW_BUILDERS[store](store, e)]
+                existing = dict(self.conn.execute(
+                    "SELECT content_hash, raw FROM learnings WHERE store = ?", (store,)))
+                stale = set(existing) - {r["content_hash"] for r in rows}
+                self.conn.executemany(
+                    "DELETE FROM learnings WHERE store = ? AND content_hash = ?",
+                    [(store, h) for h in stale],
+                )
+                added, updated, dupes = self.upsert_rows(rows, existing)
+                summary["removed"] += len(stale)
+                summary["added"] += added
+                summary["updated"] += updated
+                summary["duplicates"] += dupes
+                summary["files"] += 1
+                self._mark_ingested(path)
+
+            insights_dir = self.learnings_dir / INSIGHTS_DIR
+            if insights_dir.exists():
+                for path in sorted(insights_dir.glob("ace_*.json")):
+                    added, dupes = self.ingest_insight_file(path)
+                    summary["added"] += added
+                    summary["duplicates"] += dupes
+                    summary["files"] += 1 if added or dupes else 0
+        return summary
+
+    def ingest_insight_file(self, path: Path) -> tuple[int, int]:
+        """Append-only ingestion of one ace_* file; already-seen files are skipped."""
+        path = Path(path)
+        known = self.conn.execute(
+            "SELECT 1 FROM ingested_files WHERE path = ?", (str(path),)
+        ).fetchone()
+        if known:
+            return 0, 0
+        with open(path) as f:
+            entry = json.load(f)
+        added, dupes = self.insert_rows(rows_for_insight_file(entry))
+        self._mark_ingested(path)
+        return added, dupes
+
+    def query(self, store=None, skill=None, category=None, priority=None, status=None,
+              limit: int = 50):
+        """Indexed lookup by exact field values (skill is case-insensitive)."""
+        clauses, params = [], []
+        for column, value in (("store", store), ("category", category),
+                              ("priority", priority), ("status", status)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if skill is not None:
+            clauses.append("skill = ? COLLATE NOCASE")
+            params.append(skill)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        return [dict(r) for r in self.conn.execute(
+            f"SELECT * FROM learnings {where} ORDER BY created_at DESC LIMIT ?", params)]
+
+    def search(self, text: str, store=None, limit: int = 20):
+        """Full-text search over content, skill, category and priority."""
+        if self.has_fts:
+            terms = " ".join(f'"{t}"' for t in normalize(text).split())
+            if not terms:
+                return []
+            sql = ("SELECT l.* FROM learnings_fts f JOIN learnings l ON l.rowid = f.rowid "
+                   "WHERE learnings_fts MATCH ?")
+            params = [terms]
+            if store:
+                sql += " AND l.store = ?"
+                params.append(store)
+            sql += " ORDER BY bm25(learnings_fts) LIMIT ?"
+        else:
+            sql = "SELECT * FROM learnings WHERE content LIKE ?"
+            params = [f"%{text}%"]
+            if store:
+                sql += " AND store = ?"
+                params.append(store)
+            sql += " LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def stats(self) -> dict:
+        """Entry counts per store."""
+        rows = self.conn.execute("SELECT store, COUNT(*) AS n FROM learnings GROUP BY store")
+        return {r["store"]: r["n"] for r in rows}
+
+
+def print_rows(rows):
+    if not rows:
+        print("No matching learnings.")
+        return
+    for r in rows:
+        tags = " | ".join(v for v in (r["store"], r["skill"], r["category"], r["priority"]) if v)
+        print(f"  [{tags}] {r['content'][:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed learnings store")
+    parser.add_argument("--dir", default=str(LEARNINGS_DIR), help="Learnings directory")
+    parser.add_argument("--no-sync", action="store_true",
+                        help="Query the index as-is without syncing first")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("sync", help="Index new or changed learning files")
+
+    query_p = subparsers.add_parser("query", help="Look up learnings by field")
+    query_p.add_argument("--store", choices=sorted(set(ARRAY_FILES) | {"ace_insight", "ace_repair"}))
+    query_p.add_argument("--skill")
+    query_p.add_argument("--category")
+    query_p.add_argument("--priority")
+    query_p.add_argument("--status")
+    query_p.add_argument("--limit", type=int, default=50)
+    query_p.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    search_p = subparsers.add_parser("search", help="Full-text search")
+    search_p.add_argument("text")
+    search_p.add_argument("--store")
+    search_p.add_argument("--limit", type=int, default=20)
+    search_p.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    subparsers.add_parser("stats", help="Entry counts per store")
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    store = LearningsStore(Path(args.dir))
+    try:
+        if args.command == "sync" or not args.no_sync:
+            summary = store.sync()
+            if args.command == "sync":
+                print(f"✅ Synced {summary['files']} file(s): {summary['added']} added, "
+                      f"{summary['updated']} updated, {summary['removed']} removed, "
+                      f"{summary['duplicates']} duplicate(s) skipped")
+                return 0
+
+        if args.command == "query":
+            rows = store.query(args.store, args.skill, args.category, args.priority,
+                               args.status, args.limit)
+        elif args.command == "search":
+            rows = store.search(args.text, args.store, args.limit)
+        else:
+            for name, count in sorted(store.stats().items()):
+                print(f"  {name}: {count}")
+            return 0
+
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_rows(rows)
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Progress Log Engine
+
+Appends structured entries to issue progress logs (progress-logs/{issue-id}.md)
+and keeps a compact cross-issue index (progress-logs/.index.json) so queries
+never re-read every markdown file.
+
+- Entries are appended to the end of the log, where the "## Progress
+  Entries" section lives. A log in the older layout (other sections after
+  the entries) is migrated once so the entries section comes last; after
+  that existing content is never rewritten. The "Last Updated" header is
+  patched in place when the new timestamp has the same width.
+- The index records each file's size/mtime. A refresh skips unchanged files,
+  parses only the appended tail of files that grew, and fully re-parses
+  only files that were edited in place.
+
+Usage:
+    python ~/.agent/scripts/progress_log.py append [ISSUE_ID] [PHASE] [CONV_ID] [SUMMARY]
+        [--completed ITEM]... [--decision ITEM]... [--blocker ITEM]... [--next ITEM]...
+    python ~/.agent/scripts/progress_log.py query [--phase P] [--since 7d] [--issue I]
+    python ~/.agent/scripts/progress_log.py latest
+    python ~/.agent/scripts/progress_log.py reindex
+
+Exit codes:
+    0 - Success
+    1 - Issue ID could not be determined
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+LOGS_DIR = AGENT_DIR / "progress-logs"
+TEMPLATE_PATH = AGENT_DIR / "templates" / "progress-log-template.md"
+INDEX_NAME = ".index.json"
+INDEX_VERSION = 1
+SKIP_FILES = {"README.md"}
+ENTRIES_HEADING = "## Progress Entries"
+
+ENTRY_HEADER = re.compile(
+    r"^### \[(?P<timestamp>[^\]]*)\]\s*\{?(?P<conversation>[^}—]*?)\}?\s*—\s*Phase:\s*(?P<phase>.+?)\s*$"
+)
+TITLE = re.compile(r"^#\s+(?:\S+\s+)?(?:Progress|Task) Log\s*[:-]\s*(?P<issue>\S+)\s*$")
+SUMMARY_LINE = re.compile(r"^\*\*Summary\*\*:\s*(?P<summary>.+)$")
+BULLET = re.compile(r"^\s*[-*]\s+(?P<text>.+)$")
+LAST_UPDATED = re.compile(rb"\*\*Last Updated\*\*: (?P<value>\S+)")
+
+
+def utc_stamp(now=None):
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_stamp(value):
+    """Parse an entry timestamp; None for placeholders such as {timestamp}."""
+    try:
+        ts = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def parse_entries(text, base_offset=0):
+    """Extract entry records from markdown text starting at base_offset."""
+    entries = []
+    current = None
+    offset = base_offset
+    for line in text.splitlines(keepends=True):
+        stripped = line.rstrip("\n")
+        match = ENTRY_HEADER.match(stripped)
+        if match:
+            current = {
+                "timestamp": match.group("timestamp").strip(),
+                "conversation_id": match.group("conversation").strip(),
+                "phase": match.group("phase"),
+                "summary": "",
+                "offset": offset,
+            }
+            entries.append(current)
+        elif current is not None and not current["summary"]:
+            summary = SUMMARY_LINE.match(stripped) or BULLET.match(stripped)
+            if summary:
+                current["summary"] = summary.group(summary.lastgroup)[:200]
+        elif stripped.startswith("## "):
+            current = None
+        offset += len(line.encode())
+    return entries
+
+
+def issue_from_text(text, fallback):
+    for line in text.splitlines()[:5]:
+        match = TITLE.match(line)
+        if match:
+            return match.group("issue")
+    return fallback
+
+
+def issue_from_branch():
+    """Issue id from a branch such as agent/<user>/<issue-id>."""
+    try:
+        branch = subprocess.run(["git", "branch", "--show-current"],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+    return branch.rsplit("/", 1)[-1] if "/" in branch else None
+
+
+@contextmanager
+def locked(path):
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ProgressLogIndex:
+    """Compact index over all progress logs in a directory."""
+
+    def __init__(self, logs_dir: Path = LOGS_DIR):
+        self.logs_dir = Path(logs_dir)
+        self.index_path = self.logs_dir / INDEX_NAME
+        self.data = self._load()
+
+    def _load(self):
+        if self.index_path.exists():
+            try:
+                with open(self.index_path) as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    return data
+            except json.JSONDecodeError:
+                pass
+        return {"version": INDEX_VERSION, "files": {}}
+
+    def save(self):
+        tmp_path = self.index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def _index_file(self, path: Path, record=None):
+        """(Re)index one file, parsing only the appended tail when possible."""
+        stat = path.stat()
+        with open(path, "rb") as f:
+            if record and stat.st_size > record["size"]:
+                # Appended-only if the bytes at the old end are unchanged
+                f.seek(max(0, record["size"] - len(record["tail"])))
+                if f.read(len(record["tail"])).hex() == record["tail"]:
+                    tail = f.read().decode(errors="replace")
+                    entries = record["entries"] + parse_entries(tail, record["size"])
+                    return self._record(path, stat, record["issue_id"], entries)
+            f.seek(0)
+            text = f.read().decode(errors="replace")
+        return self._record(path, stat, issue_from_text(text, path.stem), parse_entries(text))
+
+    def _record(self, path, stat, issue_id, entries):
+        with open(path, "rb") as f:
+            f.seek(max(0, stat.st_size - 32))
+            tail = f.read().hex()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "tail": tail,
+                "issue_id": issue_id, "entries": entries}
+
+    def refresh(self):
+        """Bring the index up to date; returns the number of files re-parsed."""
+        files = self.data["files"]
+        seen = set()
+        parsed = 0
+        for path in self.logs_dir.glob("*.md"):
+            if path.name in SKIP_FILES:
+                continue
+            seen.add(path.name)
+            record = files.get(path.name)
+            stat = path.stat()
+            if record and (record["size"], record["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            files[path.name] = self._index_file(path, record)
+            parsed += 1
+        for name in set(files) - seen:
+            del files[name]
+        if parsed or set(files) != seen:
+            self.save()
+        return parsed
+
+    def entries(self):
+        for name, record in self.data["files"].items():
+            for entry in record["entries"]:
+                yield {"issue_id": record["issue_id"], "file": name, **entry}
+
+    def query(self, phase=None, since=None, issue=None, conversation=None):
+        """Entries matching all given filters, newest first."""
+        results = []
+        for entry in self.entries():
+            if phase and phase.lower() not in entry["phase"].lower():
+                continue
+            if issue and entry["issue_id"] != issue:
+                continue
+            if conversation and entry["conversation_id"] != conversation:
+                continue
+            ts = parse_stamp(entry["timestamp"])
+            if since and (ts is None or ts < since):
+                continue
+            results.append(entry)
+        results.sort(key=lambda e: e["timestamp"], reverse=True)
+        return results
+
+    def latest_per_issue(self):
+        latest = {}
+        for entry in self.entries():
+            current = latest.get(entry["issue_id"])
+            if current is None or entry["timestamp"] >= current["timestamp"]:
+                latest[entry["issue_id"]] = entry
+        return sorted(latest.values(), key=lambda e: e["timestamp"], reverse=True)
+
+
+def render_entry(timestamp, conversation_id, phase, summary, sections):
+    lines = [f"\n### [{timestamp}] {conversation_id} — Phase: {phase}\n"]
+    if summary:
+        lines.append(f"\n**Summary**: {summary}\n")
+    for heading, items in sections:
+        if items:
+            lines.append(f"\n#### {heading}\n\n")
+            lines.extend(f"- {item}\n" for item in items)
+    return "".join(lines)
+
+
+def create_log(path: Path, issue_id: str, timestamp: str):
+    template = TEMPLATE_PATH.read_text() if TEMPLATE_PATH.exists() else "# Progress Log: {ISSUE_ID}\n"
+    # The template's example entry is a placeholder, not a real entry
+    template = re.sub(r"\n### \[\{timestamp\}\].*?(?=\n---\n)", "\n", template, flags=re.S)
+    # Entries are only ever appended, so the entries section goes last
+    template = re.sub(r"\n## Progress Entries\n.*?\n---\n", "", template, count=1, flags=re.S)
+    template = template.rstrip("\n") + f"\n\n---\n\n{ENTRIES_HEADING}\n"
+    text = template.replace("{ISSUE_ID}", issue_id).replace("{timestamp}", timestamp)
+    path.write_text(text)
+
+
+def move_entries_last(path: Path) -> bool:
+    """Move the Progress Entries section to the end of an older-layout log.
+
+    Returns True when the file was rewritten.
+    """
+    text = path.read_text()
+    blocks = re.split(r"(?m)^(?=## )", text)
+    entries = [i for i, block in enumerate(blocks) if block.startswith(ENTRIES_HEADING)]
+    if not entries or entries[0] == len(blocks) - 1:
+        return False
+    section = blocks.pop(entries[0])
+    section = re.sub(r"\n-{3,}\s*$", "", section.rstrip()).rstrip()
+    rest = "".join(blocks).rstrip()
+    if not rest.endswith("---"):
+        rest += "\n\n---"
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(f"{rest}\n\n{section}\n")
+    os.replace(tmp_path, path)
+    return True
+
+
+def touch_last_updated(path: Path, timestamp: str):
+    """Patch the Last Updated header in place when the width matches."""
+    new = timestamp.encode()
+    with open(path, "r+b") as f:
+        head = f.read(2048)
+        match = LAST_UPDATED.search(head)
+        if match and len(match.group("value")) == len(new):
+            f.seek(match.start("value"))
+            f.write(new)
+
+
+def append_entry(logs_dir: Path, issue_id: str, phase: str, conversation_id: str,
+                 summary: str, sections, now=None):
+    """Append one entry and update the index; returns the log path."""
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = utc_stamp(now)
+    path = logs_dir / f"{issue_id}.md"
+    with locked(logs_dir / ".index.lock"):
+        migrated = False
+        if not path.exists():
+            create_log(path, issue_id, timestamp)
+        else:
+            migrated = move_entries_last(path)
+        with open(path, "a") as f:
+            f.write(render_entry(timestamp, conversation_id, phase, summary, sections))
+        touch_last_updated(path, timestamp)
+
+        index = ProgressLogIndex(logs_dir)
+        record = None if migrated else index.data["files"].get(path.name)
+        index.data["files"][path.name] = index._index_file(path, record)
+        index.save()
+    return path
+
+
+def parse_since(value):
+    """'7d', '12h', '30m' or an ISO timestamp."""
+    match = re.fullmatch(r"(\d+)([dhm])", value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount),
+                 "m": timedelta(minutes=amount)}[unit]
+        return datetime.now(timezone.utc) - delta
+    ts = parse_stamp(value)
+    if ts is None:
+        raise argparse.ArgumentTypeError(f"invalid --since value: {value}")
+    return ts
+
+
+def print_entries(entries):
+    if not entries:
+        print("No matching entries.")
+        return
+    for e in entries:
+        conv = f" {e['conversation_id']}" if e["conversation_id"] else ""
+        print(f"  [{e['timestamp']}] {e['issue_id']}{conv} — {e['phase']}")
+        if e["summary"]:
+            print(f"      {e['summary']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured progress log engine")
+    parser.add_argument("--dir", default=str(LOGS_DIR), help="Progress logs directory")
+    subparsers = parser.add_subparsers(dest="command")
+
+    append_p = subparsers.add_parser("append", help="Append an entry (creates the log if needed)")
+    append_p.add_argument("issue_id", nargs="?", help="Issue ID (default: from git branch)")
+    append_p.add_argument("phase", nargs="?", default="")
+    append_p.add_argument("conversation_id", nargs="?",
+                          default=os.environ.get("AGENT_SESSION_ID", ""))
+    append_p.add_argument("summary", nargs="?", default="")
+    append_p.add_argument("--completed", action="append", default=[])
+    append_p.add_argument("--decision", action="append", default=[])
+    append_p.add_argument("--insight", action="append", default=[])
+    append_p.add_argument("--blocker", action="append", default=[])
+    append_p.add_argument("--next", action="append", default=[])
+
+    query_p = subparsers.add_parser("query", help="Query entries across all logs")
+    query_p.add_argument("--phase")
+    query_p.add_argument("--since", type=parse_since, help="e.g. 7d, 12h or an ISO timestamp")
+    query_p.add_argument("--issue")
+    query_p.add_argument("--conversation")
+    query_p.add_argument("--json", action="store_true")
+
+    latest_p = subparsers.add_parser("latest", help="Latest entry per issue")
+    latest_p.add_argument("--json", action="store_true")
+
+    subparsers.add_parser("reindex", help="Rebuild the index from scratch")
+
+    args = parser.parse_args()
+    logs_dir = Path(args.dir)
+
+    if args.command == "append":
+        issue_id = args.issue_id or issue_from_branch()
+        if not issue_id:
+            print("❌ Error: Could not identify Issue ID. Please provide as first argument.")
+            return 1
+        path = logs_dir / f"{issue_id}.md"
+        sections = [
+            ("✅ Completed", args.completed),
+            ("🧠 Decisions Made", args.decision),
+            ("🔍 Reflector Insights", args.insight),
+            ("🚧 Blockers/Issues", args.blocker),
+            ("➡️ Next Steps", args.next),
+        ]
+        if not (args.phase or args.summary or any(items for _, items in sections)):
+            # No entry content: just make sure the log exists (legacy behaviour)
+            if not path.exists():
+                print(f"📝 Creating new progress log for {issue_id}...")
+                logs_dir.mkdir(parents=True, exist_ok=True)
+                create_log(path, issue_id, utc_stamp())
+            print(f"✅ Log identified: {path}")
+            return 0
+        path = append_entry(logs_dir, issue_id, args.phase or "Unspecified",
+                            args.conversation_id or "unknown-session", args.summary, sections)
+        print(f"✅ Appended entry to: {path}")
+        return 0
+
+    if args.command == "reindex":
+        index = ProgressLogIndex(logs_dir)
+        index.data = {"version": INDEX_VERSION, "files": {}}
+        print(f"✅ Indexed {index.refresh()} log file(s)")
+        return 0
+
+    if args.command in ("query", "latest"):
+        index = ProgressLogIndex(logs_dir)
+        index.refresh()
+        if args.command == "query":
+            results = index.query(args.phase, args.since, args.issue, args.conversation)
+        else:
+            results = index.latest_per_issue()
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print_entries(results)
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
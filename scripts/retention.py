@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Retention Engine
+
+Keeps the hot harness files small by moving old data into compressed,
+still-queryable archives under ~/.agent/archive/:
+
+    audit_log       logs/session_audit.log      -> audit/session_audit-YYYY-MM.log.gz
+    compliance_log  logs/compliance_log.json    -> compliance/compliance-YYYY-MM.jsonl.gz
+    checkpoints     ledgers/**/checkpoints/     -> checkpoints/<ledger>/<cp_id>.json.gz
+    ace_insights    memory/learnings/ace_insights/ -> ace_insights/ace_insights-YYYY-MM.jsonl.gz
+    brain_sessions  ~/.gemini/antigravity/brain/<id>/ -> sessions/<id>.tar.gz (opt-in)
+
+Per-store policies (age, count, size) come from DEFAULT_POLICY, overridden
+by ~/.agent/retention_policy.json. Each run only moves data that is over
+policy, so it is cheap to run often; monthly .gz archives are appended to
+as new gzip members rather than rewritten.
+
+Auto checkpoints are first thinned with checkpoint_policy.prune (the same
+retention the ledger manager applies). Archived checkpoints, manual ones
+included, are brought back with restore-checkpoint; `ledger-manager.py
+rollback` points there when asked for one. ace_insight files are synced into
+the learnings store before they are archived, so they stay searchable there.
+
+Usage:
+    python ~/.agent/scripts/retention.py run [--store NAME]... [--dry-run]
+    python ~/.agent/scripts/retention.py status
+    python ~/.agent/scripts/retention.py query STORE [--contains TEXT] [--since YYYY-MM] [--limit 50]
+    python ~/.agent/scripts/retention.py restore-checkpoint CHECKPOINT_ID
+
+Exit codes:
+    0: Success
+    1: Unknown store or checkpoint
+"""
+
+import argparse
+import fcntl
+import gzip
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AGENT_DIR / "ledgers"))
+
+POLICY_NAME = "retention_policy.json"
+STATE_NAME = "retention_state.json"
+# Shared with session-audit-log's compliance_log.json writer
+COMPLIANCE_LOCK_NAME = ".compliance_log.lock"
+AUDIT_LOCK_NAME = ".session_audit.lock"
+
+DEFAULT_POLICY = {
+    "audit_log": {"max_age_days": 30, "max_bytes": 5_000_000},
+    "compliance_log": {"max_age_days": 30, "max_entries": 5000},
+    "checkpoints": {"max_age_days": 14, "keep_last": 10},
+    "ace_insights": {"max_age_days": 30, "keep_last": 200},
+    # Lives outside ~/.agent, so it is only archived when explicitly enabled
+    "brain_sessions": {"enabled": False, "max_age_days": 30, "keep_last": 20},
+}
+STORES = tuple(DEFAULT_POLICY)
+
+
+def load_policy(agent_dir: Path) -> dict:
+    """Retention policy merged per store over the defaults."""
+    policy = json.loads(json.dumps(DEFAULT_POLICY))
+    path = agent_dir / POLICY_NAME
+    if path.exists():
+        with open(path) as f:
+            for store, settings in json.load(f).items():
+                policy.setdefault(store, {}).update(settings)
+    return policy
+
+
+def month_of(timestamp: str) -> str | None:
+    """'YYYY-MM' prefix of an ISO timestamp, or None if it is not one."""
+    try:
+        return datetime.fromisoformat(timestamp.strip().replace("Z", "+00:00")).strftime("%Y-%m")
+    except ValueError:
+        return None
+
+
+def size_of(path: Path) -> int:
+    if path.is_dir():
+        total = 0
+        for p in path.rglob("*"):
+            try:
+                total += p.stat().st_size if p.is_file() else 0
+            except FileNotFoundError:
+                pass  # removed concurrently (e.g. a checkpoint prune)
+        return total
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def append_gz(path: Path, lines) -> int:
+    """Append lines as a new gzip member; returns bytes added to the archive."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    before = size_of(path)
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        f.writelines(lines)
+    return size_of(path) - before
+
+
+def replace_hot_file(path: Path, snapshot_size: int, keep: bytes):
+    """Atomically replace path with `keep`, carrying over bytes appended
+    by other writers since the snapshot was read."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as out:
+        out.write(keep)
+        with open(path, "rb") as f:
+            f.seek(snapshot_size)
+            out.write(f.read())
+    shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class RetentionEngine:
+    """Applies the retention policy to each store and reports space reclaimed."""
+
+    def __init__(self, agent_dir: Path = AGENT_DIR, policy: dict | None = None,
+                 dry_run: bool = False, now: datetime | None = None):
+        self.agent_dir = Path(agent_dir)
+        self.archive_dir = self.agent_dir / "archive"
+        self.policy = policy or load_policy(self.agent_dir)
+        self.dry_run = dry_run
+        self.now = now or datetime.utcnow()
+
+    def cutoff(self, store: str) -> datetime:
+        return self.now - timedelta(days=self.policy[store]["max_age_days"])
+
+    def _report(self, store, archived, hot_before, hot_after, archive_added, **extra):
+        return {"store": store, "archived": archived, "hot_bytes_before": hot_before,
+                "hot_bytes_after": hot_after, "archive_bytes_added": archive_added,
+                "reclaimed_bytes": hot_before - hot_after - archive_added, **extra}
+
+    # -- stores -----------------------------------------------------------
+
+    def audit_log(self):
+        """Archive audit lines past max_age_days, then oldest lines over max_bytes."""
+        path = self.agent_dir / "logs" / "session_audit.log"
+        if not path.exists():
+            return self._report("audit_log", 0, 0, 0, 0)
+        # session-audit-log appends under the same lock
+        with open(path.with_name(AUDIT_LOCK_NAME), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._audit_log_locked(path)
+
+    def _audit_log_locked(self, path: Path):
+        policy = self.policy["audit_log"]
+        data = path.read_bytes()
+        lines = data.splitlines(keepends=True)
+        cutoff = self.cutoff("audit_log").strftime("%Y-%m-%dT%H:%M:%S")
+
+        # The log is chronological: archive a prefix of the file
+        cut = 0
+        for line in lines:
+            if line[:19].decode(errors="replace") >= cutoff:
+                break
+            cut += 1
+        remaining = len(data) - sum(len(line) for line in lines[:cut])
+        while cut < len(lines) and remaining > policy["max_bytes"]:
+            remaining -= len(lines[cut])
+            cut += 1
+        if cut == 0:
+            return self._report("audit_log", 0, len(data), len(data), 0)
+
+        archive_added = 0
+        if not self.dry_run:
+            by_month = {}
+            for line in lines[:cut]:
+                text = line.decode(errors="replace")
+                by_month.setdefault(month_of(text.split(" | ", 1)[0]) or "unknown", []).append(text)
+            for month, month_lines in sorted(by_month.items()):
+                archive_added += append_gz(self.archive_dir / "audit" / f"session_audit-{month}.log.gz",
+                                           month_lines)
+            replace_hot_file(path, len(data), b"".join(lines[cut:]))
+        return self._report("audit_log", cut, len(data), remaining, archive_added)
+
+    def compliance_log(self):
+        """Archive structured entries past max_age_days or over max_entries."""
+        path = self.agent_dir / "logs" / "compliance_log.json"
+        if not path.exists():
+            return self._report("compliance_log", 0, 0, 0, 0)
+        # session-audit-log rewrites the file under the same lock
+        with open(path.with_name(COMPLIANCE_LOCK_NAME), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._compliance_log_locked(path)
+
+    def _compliance_log_locked(self, path: Path):
+        policy = self.policy["compliance_log"]
+        hot_before = size_of(path)
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except json.JSONDecodeError:
+            return self._report("compliance_log", 0, hot_before, hot_before, 0,
+                                error="compliance_log.json is not valid JSON; left untouched")
+
+        cutoff = self.cutoff("compliance_log").isoformat()
+        old = [e for e in entries if str(e.get("timestamp", "")) < cutoff]
+        keep = [e for e in entries if str(e.get("timestamp", "")) >= cutoff]
+        if len(keep) > policy["max_entries"]:
+            overflow = len(keep) - policy["max_entries"]
+            old, keep = old + keep[:overflow], keep[overflow:]
+        if not old:
+            return self._report("compliance_log", 0, hot_before, hot_before, 0)
+
+        hot_text = json.dumps(keep, indent=2)
+        archive_added = 0
+        if not self.dry_run:
+            by_month = {}
+            for entry in old:
+                by_month.setdefault(month_of(str(entry.get("timestamp", ""))) or "unknown", []).append(
+                    json.dumps(entry) + "\n")
+            for month, month_lines in sorted(by_month.items()):
+                archive_added += append_gz(
+                    self.archive_dir / "compliance" / f"compliance-{month}.jsonl.gz", month_lines)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(hot_text)
+            os.replace(tmp_path, path)
+        return self._report("compliance_log", len(old), hot_before, len(hot_text.encode()),
+                            archive_added)
+
+    def checkpoint_dirs(self):
+        ledgers = self.agent_dir / "ledgers"
+        dirs = [ledgers / "checkpoints"]
+        dirs += sorted((ledgers / "missions").glob("*/checkpoints"))
+        return [d for d in dirs if d.is_dir()]
+
+    def checkpoints(self):
+        """Prune auto checkpoints, then archive those past keep_last and max_age_days."""
+        import checkpoint_policy
+        from ledger_history import checkpoint_index
+
+        policy = self.policy["checkpoints"]
+        cutoff = self.cutoff("checkpoints")
+        archived = pruned = hot_before = hot_after = archive_added = 0
+        for checkpoint_dir in self.checkpoint_dirs():
+            hot_before += size_of(checkpoint_dir)
+            if not self.dry_run:
+                retention = checkpoint_policy.load_policy(checkpoint_dir.parent)["retention"]
+                pruned += len(checkpoint_policy.prune(checkpoint_dir, retention, self.now))
+
+            index = checkpoint_index(checkpoint_dir)
+            keep_last = policy["keep_last"]
+            candidates = index[:-keep_last] if keep_last else index
+            rel = checkpoint_dir.parent.relative_to(self.agent_dir / "ledgers").as_posix()
+            target_dir = self.archive_dir / "checkpoints" / ("_default" if rel == "." else rel)
+            for ts, cp_id in candidates:
+                if ts >= cutoff:
+                    continue
+                source = checkpoint_dir / f"{cp_id}.json"
+                if self.dry_run:
+                    archived += 1
+                    hot_after -= size_of(source)
+                    continue
+                target = target_dir / f"{cp_id}.json.gz"
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    src = open(source, "rb")
+                except FileNotFoundError:
+                    continue  # pruned by a background checkpoint writer meanwhile
+                with src, gzip.open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                archived += 1
+                archive_added += size_of(target)
+                source.unlink(missing_ok=True)
+            hot_after += size_of(checkpoint_dir)
+        return self._report("checkpoints", archived, hot_before, hot_after, archive_added,
+                            pruned=pruned)
+
+    def ace_insights(self):
+        """Archive ace_* insight files past keep_last and max_age_days."""
+        learnings_dir = self.agent_dir / "memory" / "learnings"
+        insights_dir = learnings_dir / "ace_insights"
+        if not insights_dir.is_dir():
+            return self._report("ace_insights", 0, 0, 0, 0)
+        policy = self.policy["ace_insights"]
+        cutoff = self.cutoff("ace_insights").timestamp()
+        files = sorted(insights_dir.glob("ace_*.json"), key=lambda p: p.stat().st_mtime)
+        keep_last = policy["keep_last"]
+        old = [p for p in (files[:-keep_last] if keep_last else files) if p.stat().st_mtime < cutoff]
+        hot_before = size_of(insights_dir)
+        if not old:
+            return self._report("ace_insights", 0, hot_before, hot_before, 0)
+        if self.dry_run:
+            return self._report("ace_insights", len(old), hot_before,
+                                hot_before - sum(size_of(p) for p in old), 0)
+
+        # Index the insights first so they stay searchable in the learnings store
+        try:
+            from learnings_store import LearningsStore
+            store = LearningsStore(learnings_dir)
+            store.sync()
+            store.close()
+        except Exception as e:
+            print(f"⚠️  Could not sync learnings store before archiving: {e}")
+
+        by_month = {}
+        for path in old:
+            month = datetime.utcfromtimestamp(path.stat().st_mtime).strftime("%Y-%m")
+            try:
+                data = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                data = {"raw": path.read_text()}
+            by_month.setdefault(month, []).append(json.dumps({"file": path.name, "data": data}) + "\n")
+        archive_added = 0
+        for month, month_lines in sorted(by_month.items()):
+            archive_added += append_gz(
+                self.archive_dir / "ace_insights" / f"ace_insights-{month}.jsonl.gz", month_lines)
+        for path in old:
+            path.unlink()
+        return self._report("ace_insights", len(old), hot_before, size_of(insights_dir), archive_added)
+
+    def brain_sessions(self):
+        """Archive brain session dirs past keep_last and max_age_days (opt-in)."""
+        policy = self.policy["brain_sessions"]
+        brain_dir = Path.home() / ".gemini" / "antigravity" / "brain"
+        if not policy.get("enabled") or not brain_dir.is_dir():
+            return self._report("brain_sessions", 0, 0, 0, 0, skipped=not policy.get("enabled"))
+        import tarfile
+
+        cutoff = self.cutoff("brain_sessions").timestamp()
+        dirs = sorted((d for d in brain_dir.iterdir() if d.is_dir()), key=lambda d: d.stat().st_mtime)
+        keep_last = policy["keep_last"]
+        old = [d for d in (dirs[:-keep_last] if keep_last else dirs) if d.stat().st_mtime < cutoff]
+        hot_before = sum(size_of(d) for d in dirs)
+        freed = sum(size_of(d) for d in old)
+        archive_added = 0
+        if not self.dry_run:
+            target_dir = self.archive_dir / "sessions"
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for session in old:
+                target = target_dir / f"{session.name}.tar.gz"
+                with tarfile.open(target, "w:gz") as tar:
+                    tar.add(session, arcname=session.name)
+                archive_added += size_of(target)
+                shutil.rmtree(session)
+        return self._report("brain_sessions", len(old), hot_before, hot_before - freed, archive_added)
+
+    # -- driver -----------------------------------------------------------
+
+    def run(self, stores=STORES) -> list:
+        """Apply retention to the given stores under a single-runner lock."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        reports = []
+        with open(self.archive_dir / ".retention.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            for store in stores:
+                reports.append(getattr(self, store)())
+            if not self.dry_run:
+                self._record_run(reports)
+        return reports
+
+    def _record_run(self, reports):
+        path = self.archive_dir / STATE_NAME
+        state = json.loads(path.read_text()) if path.exists() else {}
+        for report in reports:
+            entry = state.setdefault(report["store"], {"archived_total": 0, "reclaimed_bytes_total": 0})
+            entry["last_run"] = self.now.isoformat()
+            entry["archived_total"] += report["archived"]
+            entry["reclaimed_bytes_total"] += report["reclaimed_bytes"]
+        tmp_path = path.with_name(f".{STATE_NAME}.tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# Querying archives
+# ---------------------------------------------------------------------------
+
+ARCHIVE_GLOBS = {
+    "audit_log": ("audit", "session_audit-*.log.gz"),
+    "compliance_log": ("compliance", "compliance-*.jsonl.gz"),
+    "ace_insights": ("ace_insights", "ace_insights-*.jsonl.gz"),
+    "checkpoints": ("checkpoints", "**/cp_*.json.gz"),
+    "brain_sessions": ("sessions", "*.tar.gz"),
+}
+
+
+def query_archive(agent_dir: Path, store: str, contains: str | None = None,
+                  since: str | None = None, limit: int = 50):
+    """Yield archived records (lines, or names for checkpoints/sessions)."""
+    subdir, pattern = ARCHIVE_GLOBS[store]
+    root = agent_dir / "archive" / subdir
+    count = 0
+    for path in sorted(root.glob(pattern)):
+        if store in ("checkpoints", "brain_sessions"):
+            name = path.relative_to(root).as_posix()
+            if contains and contains not in name:
+                continue
+            yield name
+            count += 1
+        else:
+            month = path.name.split("-", 1)[1][:7]
+            if since and month < since:
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if contains and contains not in line:
+                        continue
+                    yield line.rstrip("\n")
+                    count += 1
+                    if count >= limit:
+                        return
+        if count >= limit:
+            return
+
+
+def restore_checkpoint(agent_dir: Path, checkpoint_id: str) -> Path | None:
+    """Decompress an archived checkpoint back into its ledger's checkpoint dir."""
+    root = agent_dir / "archive" / "checkpoints"
+    for path in root.glob(f"**/{checkpoint_id}.json.gz"):
+        rel = path.parent.relative_to(root).as_posix()
+        ledger_dir = agent_dir / "ledgers" / ("" if rel == "_default" else rel)
+        target = ledger_dir / "checkpoints" / f"{checkpoint_id}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "rb") as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        path.unlink()
+        return target
+    return None
+
+
+def human(num_bytes: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retention, compaction and archival for harness state")
+    parser.add_argument("--agent-dir", default=str(AGENT_DIR), help="Harness directory (default: ~/.agent)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_p = subparsers.add_parser("run", help="Apply the retention policy")
+    run_p.add_argument("--store", action="append", choices=STORES, help="Only these store(s)")
+    run_p.add_argument("--dry-run", action="store_true", help="Report without moving anything")
+    run_p.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    subparsers.add_parser("status", help="Show hot and archive sizes")
+
+    query_p = subparsers.add_parser("query", help="Search archived data")
+    query_p.add_argument("store", choices=sorted(ARCHIVE_GLOBS))
+    query_p.add_argument("--contains", help="Substring filter")
+    query_p.add_argument("--since", help="Only archives from this month on (YYYY-MM)")
+    query_p.add_argument("--limit", type=int, default=50)
+
+    restore_p = subparsers.add_parser("restore-checkpoint", help="Move an archived checkpoint back")
+    restore_p.add_argument("checkpoint_id")
+
+    args = parser.parse_args()
+    agent_dir = Path(args.agent_dir)
+
+    if args.command == "run":
+        engine = RetentionEngine(agent_dir, dry_run=args.dry_run)
+        reports = engine.run(args.store or STORES)
+        if args.json:
+            print(json.dumps(reports, indent=2))
+            return 0
+        print(f"🧹 Retention {'(dry run) ' if args.dry_run else ''}— {engine.now.isoformat()}Z")
+        print("=" * 60)
+        for r in reports:
+            if r.get("skipped"):
+                print(f"  ⏭️  {r['store']:<15} disabled by policy")
+                continue
+            print(f"  {'📦' if r['archived'] else '✅'} {r['store']:<15} archived {r['archived']:>6}  "
+                  f"hot {human(r['hot_bytes_before'])} -> {human(r['hot_bytes_after'])}  "
+                  f"reclaimed {human(r['reclaimed_bytes'])}")
+            if r.get("error"):
+                print(f"     ⚠️  {r['error']}")
+        total = sum(r["reclaimed_bytes"] for r in reports)
+        print(f"\n💾 Space reclaimed: {human(total)}")
+        return 0
+
+    if args.command == "status":
+        engine = RetentionEngine(agent_dir)
+        hot = {
+            "audit_log": size_of(agent_dir / "logs" / "session_audit.log"),
+            "compliance_log": size_of(agent_dir / "logs" / "compliance_log.json"),
+            "checkpoints": sum(size_of(d) for d in engine.checkpoint_dirs()),
+            "ace_insights": size_of(agent_dir / "memory" / "learnings" / "ace_insights"),
+        }
+        print("📊 Retention Status")
+        for store, (subdir, _) in ARCHIVE_GLOBS.items():
+            print(f"  {store:<15} hot {human(hot.get(store, 0)):>10}   "
+                  f"archive {human(size_of(agent_dir / 'archive' / subdir)):>10}")
+        state_path = agent_dir / "archive" / STATE_NAME
+        if state_path.exists():
+            for store, entry in json.loads(state_path.read_text()).items():
+                print(f"  {store:<15} last run {entry['last_run']}, "
+                      f"{entry['archived_total']} archived, {human(entry['reclaimed_bytes_total'])} reclaimed")
+        return 0
+
+    if args.command == "query":
+        for record in query_archive(agent_dir, args.store, args.contains, args.since, args.limit):
+            print(record)
+        return 0
+
+    if args.command == "restore-checkpoint":
+        target = restore_checkpoint(agent_dir, args.checkpoint_id)
+        if target is None:
+            print(f"❌ Archived checkpoint not found: {args.checkpoint_id}")
+            return 1
+        print(f"✅ Restored {args.checkpoint_id} to {target}")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,10 @@ Purpose: Ensure all tasks in task.md are completed before allowing RTB or Debrie
 import sys
 import re
 from pathlib import Path
+from harness_cache import brain_session_dirs, read_text
+import harness_trace
 
+@harness_trace.traced("todo.find_task_md")
 def find_task_md():
     """Find the current task.md file."""
     # Check current directory
@@ -21,24 +24,17 @@ def find_task_md():
         return agent_task
         
     # Check brain directory (most recent session)
-    brain_dir = Path.home() / ".gemini" / "antigravity" / "brain"
-    if brain_dir.exists():
-        # Get session directories sorted by modification time
-        session_dirs = sorted(
-            [d for d in brain_dir.iterdir() if d.is_dir()],
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )
-        for session_dir in session_dirs:
-            task_file = session_dir / "task.md"
-            if task_file.exists():
-                return task_file
+    for session_dir in brain_session_dirs():
+        task_file = session_dir / "task.md"
+        if task_file.exists():
+            return task_file
                 
     return None
 
+@harness_trace.traced("todo.check_todos")
 def check_todos(task_file):
     """Check for unfinished todos in the task file."""
-    content = task_file.read_text()
+    content = read_text(task_file)
     
     # Find all todo items: - [ ] or * [ ]
     # We only care about root-level tasks in the "Current Task" or "Tasks" sections
@@ -69,4 +65,5 @@ def main():
     sys.exit(0)
 
 if __name__ == "__main__":
-    main()
+    with harness_trace.span("todo-enforcer"):
+        main()
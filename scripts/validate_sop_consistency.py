@@ -23,6 +23,8 @@ from typing import Dict, List, Tuple, Any
 import subprocess
 import re
 
+import harness_trace
+
 
 class SOPValidator:
     """Validates SOP consistency across agent directories."""
@@ -177,7 +179,7 @@ class SOPValidator:
 
             try:
                 os.chdir(directory)
-                result = subprocess.run(
+                result = harness_trace.run(
                     ["git", "status", "--porcelain"],
                     capture_output=True,
                     text=True,
@@ -207,7 +209,7 @@ class SOPValidator:
 
         try:
             # Check if markdownlint is available
-            result = subprocess.run(
+            result = harness_trace.run(
                 ["markdownlint", "--version"], capture_output=True, text=True, timeout=5
             )
 
@@ -251,7 +253,7 @@ class SOPValidator:
                 continue
 
             try:
-                result = subprocess.run(
+                result = harness_trace.run(
                     ["markdownlint", str(file_path)],
                     capture_output=True,
                     text=True,
@@ -274,6 +276,32 @@ class SOPValidator:
 
         return len(lint_errors) == 0
 
+    def check_doc_index_freshness(self) -> bool:
+        """Check that the doc section index matches the current docs."""
+        self.log_info("Checking doc section index freshness...")
+
+        from doc_index import DocIndex
+
+        index = DocIndex(self.global_agent_dir)
+        if not index.index_path.exists():
+            self.log_warning(
+                "Doc section index not built - run: python ~/.agent/scripts/doc_index.py build"
+            )
+            return True
+
+        stale = index.stale_files()
+        if stale:
+            self.log_warning(
+                f"Doc section index is stale for {len(stale)} file(s) - "
+                "run: python ~/.agent/scripts/doc_index.py build"
+            )
+            for rel in stale[:5]:
+                self.log_warning(f"  {rel}")
+            return False
+
+        self.log_info(f"✓ Doc section index is fresh: {index.index_path}")
+        return True
+
     def check_file_placement_consistency(self) -> bool:
         """Check that files are in correct directories per SOP."""
         self.log_info("Checking file placement consistency...")
@@ -409,11 +437,13 @@ class SOPValidator:
             self.check_file_placement_consistency,
             self.check_git_status,
             self.check_markdown_linting,
+            self.check_doc_index_freshness,
         ]
 
         for check in checks:
             try:
-                check()
+                with harness_trace.span(f"sop.{check.__name__}"):
+                    check()
                 print("-" * 40)
             except Exception as e:
                 self.log_error(f"Validation check failed: {e}")
@@ -475,7 +505,8 @@ def main():
     project_dir = Path(args.project_dir) if args.project_dir else None
     validator = SOPValidator(project_dir if project_dir else Path.cwd())
 
-    exit_code, errors, warnings = validator.validate_all()
+    with harness_trace.span("sop.validate_all", project_dir=str(validator.project_dir)):
+        exit_code, errors, warnings = validator.validate_all()
     validator.print_summary()
 
     return exit_code